@@ -1,10 +1,10 @@
 import logging
+from collections import deque
 from typing import cast
 
 from geniusweb.actions.Accept import Accept
 from geniusweb.actions.Action import Action
 from geniusweb.actions.Offer import Offer
-from geniusweb.bidspace.AllBidsList import AllBidsList
 from geniusweb.inform.ActionDone import ActionDone
 from geniusweb.inform.Finished import Finished
 from geniusweb.inform.Inform import Inform
@@ -18,6 +18,11 @@ from geniusweb.profileconnection.ProfileConnectionFactory import (
 )
 from geniusweb.progress.ProgressRounds import ProgressRounds
 
+from .bid_index import SortedBidIndex, open_index
+from .compact_bid import BidCodec
+from .opponent_model import OpponentModel
+from .top_bids import best_bids
+
 
 class Group27_NegotiationAssignment_Agent(DefaultParty):
     """
@@ -32,12 +37,16 @@ class Group27_NegotiationAssignment_Agent(DefaultParty):
         self.latest_bid: Bid = None
         self.all_bids = []
         self.opponent_preferences = []
-        self.opponent_value_count = {}
+        self.opponent_model: OpponentModel = None
         self.all_good_bids = []
-        self.all_previously_offered_bids = []
+        self.all_previously_offered_bids = deque()
+        self.previously_offered = None
+        self.suitable_bid_cursor = 0
         self.not_important_issues = []
         self.middle_issues = []
-        self.all_available_bids_sorted = []
+        self.all_available_bids_sorted: SortedBidIndex = None
+        """ Received bids are kept as compact bids, our own bids as their position in the sorted bid index """
+        self._codec: BidCodec = None
 
     def notifyChange(self, info: Inform):
         """This is the entry point of all interaction with your agent after is has been initialised.
@@ -115,16 +124,15 @@ class Group27_NegotiationAssignment_Agent(DefaultParty):
         self.get_not_important_issues()
 
         """
-            Initialize dictionary where we store the count of each value for each issue in opponent's bids
+            Initialize the model where we store the count of each value for each issue in opponent's bids
             Used for opponent modelling
         """
-        issues = profile.getDomain().getIssues()
-        for issue in issues:
-            self.opponent_value_count[issue] = {}
-            for value in profile.getDomain().getValues(issue):
-                self.opponent_value_count[issue][value] = 0
-        """ Save a list of all bids in the domain ordered by utility """
-        self.order_bids()
+        self.opponent_model = OpponentModel(profile.getDomain())
+        self._codec = BidCodec(profile.getDomain())
+        """ The sorted bid index is only built when it is needed, the opening bids come from a best first search """
+        """ Keep track of the positions in the sorted bid index of the bids we offered """
+        self.previously_offered = set()
+        self.suitable_bid_cursor = 0
 
     """
         Every time we receive a bid, add 1 to the counter for that value
@@ -132,9 +140,7 @@ class Group27_NegotiationAssignment_Agent(DefaultParty):
     """
 
     def update_opponent_counts(self):
-        lrb = self._last_received_bid
-        for issue in lrb.getIssues():
-            self.opponent_value_count[issue][lrb.getValue(issue)] += 1
+        self.opponent_model.update(self._last_received_bid)
 
     # execute a turn
     def _myTurn(self):
@@ -148,7 +154,9 @@ class Group27_NegotiationAssignment_Agent(DefaultParty):
             """ We update the count for each value for each issue of our opponent """
             self.update_opponent_counts()
             """ We update the list of all issues sent by our opponent """
-            self.all_bids.append((self._last_received_bid, profile.getUtility(self._last_received_bid)))
+            self.all_bids.append(
+                (self._codec.encode(self._last_received_bid), profile.getUtility(self._last_received_bid))
+            )
 
         if self._isGood(self._last_received_bid):
             """ if so, accept the offer """
@@ -192,21 +200,20 @@ class Group27_NegotiationAssignment_Agent(DefaultParty):
         return False
 
     def _findBid(self) -> Bid:
-
-        bid_offer = self.get_suitable_bid()[0][0]
-        if bid_offer is not None:
-            self.all_previously_offered_bids.append(bid_offer)
-        if bid_offer is None:
+        position = self.get_suitable_bid()
+        if position is not None:
+            bid = self.all_available_bids_sorted.get(position)
+            self.previously_offered.add(position)
+            self.all_previously_offered_bids.append(position)
+        elif len(self.all_previously_offered_bids) == 0:
             """ When we have not offered a bid, offer highest preference """
-            if len(self.all_previously_offered_bids) == 0:
-                bid = self.get_highest_bid()
-            else:
-                """  since no new good offers are available, start offering what we have already offered before
-                (starting from the best available offers) """
-                bid = self.all_previously_offered_bids.pop(0)
-                self.all_previously_offered_bids.append(bid)
+            bid = self.get_highest_bid()
         else:
-            bid = bid_offer
+            """  since no new good offers are available, start offering what we have already offered before
+            (starting from the best available offers) """
+            position = self.all_previously_offered_bids.popleft()
+            self.all_previously_offered_bids.append(position)
+            bid = self.all_available_bids_sorted.get(position)
         print("Bid utility------------", self._profile.getProfile().getUtility(bid))
 
         return bid
@@ -214,64 +221,49 @@ class Group27_NegotiationAssignment_Agent(DefaultParty):
     """
         Selects a favorable bid for the opponent based on issues that are not important to us,
         but we consider them to be important fo the opponent.
+        Returns the position of the bid in the sorted bid index, or None if there is no suitable bid.
     """
 
     def get_suitable_bid(self):
-        all_bids = self.all_available_bids_sorted
-
         opponent_desired_bid = self.get_opponent_info_good()
-        not_important_issues = self.not_important_issues
 
-        chosen_bid = None
-        chosen_bid_utility = None
+        """ Without a model of the opponent, only make an offer when no issue is unimportant to us """
+        if opponent_desired_bid is None and len(self.not_important_issues) > 0:
+            return None
 
-        for bid, bid_utility in all_bids:
-            counter = 0
-            if bid not in self.all_previously_offered_bids:
-                if opponent_desired_bid is not None:
-                    for not_important_issue in not_important_issues:
-                        if bid.getIssueValues().get(not_important_issue) == opponent_desired_bid.get(
-                                not_important_issue):
-                            counter += 1
+        bid_index = self.order_bids()
 
-                if (opponent_desired_bid is not None or counter == len(not_important_issues)) and self._isGood(bid):
-                    chosen_bid = bid
-                    chosen_bid_utility = bid_utility
-                    break
+        """
+            Skip the bids that we have offered before, starting where the previous scan stopped.
+            The cursor only moves forward, so a whole session costs at most one pass over the bids.
+        """
+        while self.suitable_bid_cursor < bid_index.size() and self.suitable_bid_cursor in self.previously_offered:
+            self.suitable_bid_cursor += 1
+        if self.suitable_bid_cursor == bid_index.size():
+            return None
 
-        return [(chosen_bid, chosen_bid_utility)]
+        """ The bids are sorted on utility, if this bid is not good then none of the remaining bids are """
+        if self._isGood(bid_index.get(self.suitable_bid_cursor)):
+            return self.suitable_bid_cursor
+        return None
 
     """
         Sorts all available bids on utility.
+        The sorted bid index is built only once per profile, large domains are indexed on disk.
     """
 
     def order_bids(self):
-        domain = self._profile.getProfile().getDomain()
-        all_bids = AllBidsList(domain)
-
-        bids_with_utility = []
-
-        for bid in all_bids:
-            bids_with_utility.append((bid, self._profile.getProfile().getUtility(bid)))
-
-        bids_with_utility = sorted(bids_with_utility, key=lambda item: -item[1])
-        self.all_available_bids_sorted = bids_with_utility
+        if self.all_available_bids_sorted is None:
+            self.all_available_bids_sorted = open_index(self._profile.getProfile())
+        return self.all_available_bids_sorted
 
     """
-        Sorts all bids and selects the one with highest utility.
+        Selects the bid with highest utility, the first bid of a best first search over the values of every issue,
+        so the opening bid does not wait for the sorted bid index.
     """
 
     def get_highest_bid(self):
-        domain = self._profile.getProfile().getDomain()
-        all_bids = AllBidsList(domain)
-
-        bids_with_utility = []
-
-        for bid in all_bids:
-            bids_with_utility.append((bid, self._profile.getProfile().getUtility(bid)))
-
-        bids_with_utility = sorted(bids_with_utility, key=lambda item: -item[1])
-        return bids_with_utility[0][0]
+        return next(best_bids(self._profile.getProfile()))[0]
 
     """
         Returns a dictionary where the keys are the issues
@@ -283,19 +275,8 @@ class Group27_NegotiationAssignment_Agent(DefaultParty):
         if len(self.all_bids) < 2:
             return None
 
-        issues = self._profile.getProfile().getDomain().getIssues()
-
-        opponent_counts = self.opponent_value_count
-        demanded_best_offer = {}
-
-        """ For each issue, sort by the number of occurrences of each value and take the highest """
-        for issue in issues:
-            opponent_values = opponent_counts[issue]
-            sorted_dict = dict(sorted(opponent_values.items(), key=lambda item: item[1]))
-            opponent_val = list(sorted_dict.keys())[-1]
-            demanded_best_offer[issue] = opponent_val
-
-        return demanded_best_offer
+        """ The opponent model keeps the most occurring value for each issue up to date """
+        return self.opponent_model.preferred_bid()
 
     """
         Returns two arrays containing issues that are not important and issues that are somewhat
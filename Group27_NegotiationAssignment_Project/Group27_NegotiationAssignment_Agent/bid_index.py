@@ -0,0 +1,160 @@
+import hashlib
+import json
+import os
+from math import prod
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+from geniusweb.issuevalue.Bid import Bid
+from geniusweb.profile.utilityspace.LinearAdditive import LinearAdditive
+
+# directory of the on-disk indexes, one subdirectory per domain and profile
+INDEX_DIRECTORY = "results/bid_index"
+# domains with more bids than this are indexed on disk by default
+ON_DISK_THRESHOLD = 1_000_000
+
+
+class SortedBidIndex:
+    """
+    All bids of the domain sorted on utility, highest utility first.
+
+    The index is built once per profile. Every bid is stored as a row of value
+    indices (one per issue, issues sorted by name) in a compact integer matrix,
+    next to an array with the float utility of each bid. Position 0 holds the
+    best bid, and because the utilities are sorted the bids above a utility
+    threshold are found with a binary search.
+
+    With a directory the index is stored on disk: the sorted bid matrix and the
+    utilities (as float32) are .npy files that are memory mapped, so only the
+    pages of the bids that are looked at are read, and the index of a profile
+    that was indexed before opens in milliseconds on any domain size.
+    """
+
+    def __init__(self, profile: LinearAdditive, directory: Optional[str] = None):
+        domain = profile.getDomain()
+        utilities = profile.getUtilities()
+
+        self._issues = sorted(domain.getIssues())
+        self._values = [list(domain.getValues(issue)) for issue in self._issues]
+
+        # weighted utility of every value of every issue
+        self._weighted = [
+            np.array(
+                [
+                    float(profile.getWeight(issue) * utilities[issue].getUtility(v))
+                    for v in values
+                ]
+            )
+            for issue, values in zip(self._issues, self._values)
+        ]
+
+        if directory is None:
+            self._rows, self._utilities = self._build()
+        else:
+            self._rows, self._utilities = self._open(directory)
+
+    def _build(self) -> Tuple[np.ndarray, np.ndarray]:
+        radices = [len(values) for values in self._values]
+
+        # enumerate all bids by decoding every bid number in mixed radix
+        size = prod(radices)
+        dtype = np.min_scalar_type(max(radices) - 1)
+        rows = np.empty((size, len(radices)), dtype=dtype)
+        remainder = np.arange(size)
+        bid_utilities = np.zeros(size)
+        for i in reversed(range(len(radices))):
+            rows[:, i] = remainder % radices[i]
+            remainder //= radices[i]
+            bid_utilities += self._weighted[i][rows[:, i]]
+
+        order = np.argsort(-bid_utilities, kind="stable")
+        return rows[order], bid_utilities[order]
+
+    def _open(self, directory: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Map the index files of the profile, building them if they do not exist"""
+        directory = os.path.join(directory, self._key())
+        rows_path = os.path.join(directory, "rows.npy")
+        utilities_path = os.path.join(directory, "utilities.npy")
+
+        if not (os.path.exists(rows_path) and os.path.exists(utilities_path)):
+            os.makedirs(directory, exist_ok=True)
+            rows, utilities = self._build()
+            # sorting on float64 first keeps the float32 utilities sorted
+            _save(rows_path, rows)
+            _save(utilities_path, utilities.astype(np.float32))
+            del rows, utilities
+
+        return np.load(rows_path, mmap_mode="r"), np.load(utilities_path, mmap_mode="r")
+
+    def _key(self) -> str:
+        # the issues, values and weighted utilities fully determine the index
+        content: List[list] = [
+            [issue, [str(v) for v in values], weighted.tolist()]
+            for issue, values, weighted in zip(
+                self._issues, self._values, self._weighted
+            )
+        ]
+        return hashlib.sha1(json.dumps(content).encode("utf-8")).hexdigest()
+
+    def size(self) -> int:
+        return len(self._utilities)
+
+    def get(self, position: int) -> Bid:
+        """Returns the bid at the given position, 0 being the best bid"""
+        row = self._rows[position]
+        return Bid(
+            {issue: self._values[i][row[i]] for i, issue in enumerate(self._issues)}
+        )
+
+    def utility(self, position: int) -> float:
+        return float(self._utilities[position])
+
+    def best(self) -> Bid:
+        return self.get(0)
+
+    def kth_best(self, k: int) -> Bid:
+        """Returns the k-th best bid, k = 1 being the best bid"""
+        return self.get(k - 1)
+
+    def count_at_least(self, threshold: float) -> int:
+        """Returns the number of bids with utility >= threshold, these are the bids
+        at positions 0 up to this number
+        """
+        # binary search on the descending utilities, it only touches log(n) pages
+        low, high = 0, self.size()
+        while low < high:
+            middle = (low + high) // 2
+            if self._utilities[middle] >= threshold:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def at_least(self, threshold: float) -> range:
+        """Returns the positions of all bids with utility >= threshold"""
+        return range(self.count_at_least(threshold))
+
+    def __iter__(self) -> Iterator[Tuple[Bid, float]]:
+        for position in range(self.size()):
+            yield self.get(position), self.utility(position)
+
+
+def open_index(
+    profile: LinearAdditive, directory: Optional[str] = None
+) -> SortedBidIndex:
+    """The sorted bid index of a profile. Large domains (or any domain, when a
+    directory is given) are indexed on disk, smaller domains in memory.
+    """
+    domain = profile.getDomain()
+    size = prod(len(list(domain.getValues(issue))) for issue in domain.getIssues())
+    if directory is None and size > ON_DISK_THRESHOLD:
+        directory = INDEX_DIRECTORY
+    return SortedBidIndex(profile, directory)
+
+
+def _save(path: str, array: np.ndarray):
+    # through a temporary file, so agents that build the same index at once are safe
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as f:
+        np.save(f, array)
+    os.replace(temporary, path)
@@ -0,0 +1,70 @@
+from typing import Dict, List
+
+from geniusweb.issuevalue.Bid import Bid
+from geniusweb.issuevalue.Domain import Domain
+from geniusweb.issuevalue.Value import Value
+
+
+class OpponentModel:
+    """
+    Frequency model of the opponent's bids.
+
+    For every issue the number of times the opponent bid each value is kept in a
+    fixed array, together with the index of the most frequent value. That index
+    is kept up to date on every update, so the bid that the opponent prefers is
+    available in O(#issues) no matter how many bids were received. When values
+    are equally frequent, the value that comes last in the domain is preferred,
+    or with recent_ties the value that the opponent first bid most recently (the
+    last of the counts in a dict, stably sorted on count).
+    """
+
+    def __init__(self, domain: Domain, recent_ties: bool = False):
+        self._issues: List[str] = list(domain.getIssues())
+        self._values: List[List[Value]] = [
+            list(domain.getValues(issue)) for issue in self._issues
+        ]
+        self._value_index: List[Dict[Value, int]] = [
+            {value: i for i, value in enumerate(values)} for values in self._values
+        ]
+        self._counts: List[List[int]] = [[0] * len(values) for values in self._values]
+        self._most_frequent: List[int] = [len(values) - 1 for values in self._values]
+        self._bid_count = 0
+
+        # rank of every value among equally frequent values, higher is preferred
+        self._recent_ties = recent_ties
+        self._tie_rank: List[List[int]] = [list(range(len(values))) for values in self._values]
+
+    def update(self, bid: Bid):
+        """Count the values of a bid that was received from the opponent"""
+        self._bid_count += 1
+        for i, issue in enumerate(self._issues):
+            index = self._value_index[i].get(bid.getValue(issue))
+            if index is None:
+                continue
+            counts = self._counts[i]
+            if self._recent_ties and counts[index] == 0:
+                self._tie_rank[i][index] = self._bid_count
+            counts[index] += 1
+
+            # only the count of this value changed, so it is the only candidate for a new maximum
+            best = self._most_frequent[i]
+            tie_rank = self._tie_rank[i]
+            if counts[index] > counts[best] or (
+                counts[index] == counts[best] and tie_rank[index] > tie_rank[best]
+            ):
+                self._most_frequent[i] = index
+
+    def bid_count(self) -> int:
+        """Number of opponent bids in the model"""
+        return self._bid_count
+
+    def value_count(self, issue: str, value: Value) -> int:
+        i = self._issues.index(issue)
+        return self._counts[i][self._value_index[i][value]]
+
+    def preferred_bid(self) -> Dict[str, Value]:
+        """Returns for every issue the value that the opponent bid most often"""
+        return {
+            issue: self._values[i][self._most_frequent[i]]
+            for i, issue in enumerate(self._issues)
+        }
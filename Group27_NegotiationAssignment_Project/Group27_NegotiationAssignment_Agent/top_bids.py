@@ -0,0 +1,96 @@
+from decimal import Decimal
+from heapq import heappop, heappush
+from typing import Generic, Iterable, Iterator, List, Tuple, TypeVar
+
+from geniusweb.issuevalue.Bid import Bid
+from geniusweb.profile.utilityspace.LinearAdditive import LinearAdditive
+
+T = TypeVar("T")
+
+
+def best_bids(profile: LinearAdditive) -> Iterator[Tuple[Bid, Decimal]]:
+    """
+    Yields all bids of the domain with their utility, highest utility first,
+    without enumerating the domain.
+
+    The values of every issue are ranked on weighted utility, and a bid is a
+    rank per issue. Bids are searched best first: the best bid has rank 0 for
+    every issue, and every bid that is taken from the heap pushes the bids that
+    are one rank worse on one issue. Lowering only issues from the last lowered
+    issue onwards creates every bid exactly once. The first k bids cost
+    O(k log k) (times the number of issues), and equal utilities come out in a
+    fixed order.
+    """
+    domain = profile.getDomain()
+    utilities = profile.getUtilities()
+    issues = sorted(domain.getIssues())
+
+    # per issue the weighted utilities and values, best value first
+    ranked: List[List[Tuple[Decimal, object]]] = []
+    for issue in issues:
+        weight = profile.getWeight(issue)
+        ranked.append(
+            sorted(
+                (
+                    (weight * utilities[issue].getUtility(value), value)
+                    for value in domain.getValues(issue)
+                ),
+                key=lambda item: item[0],
+                reverse=True,
+            )
+        )
+    if not all(ranked):
+        return
+
+    # entries are (negated utility, ranks, first issue that may be lowered)
+    best = sum((values[0][0] for values in ranked), Decimal(0))
+    heap = [(-best, (0,) * len(issues), 0)]
+    while heap:
+        negated, ranks, first = heappop(heap)
+        yield Bid(
+            {issue: ranked[i][ranks[i]][1] for i, issue in enumerate(issues)}
+        ), -negated
+
+        for i in range(first, len(issues)):
+            rank = ranks[i]
+            if rank + 1 < len(ranked[i]):
+                loss = ranked[i][rank][0] - ranked[i][rank + 1][0]
+                lowered = ranks[:i] + (rank + 1,) + ranks[i + 1 :]
+                heappush(heap, (negated + loss, lowered, i))
+
+
+class LazyList(Generic[T]):
+    """
+    The items of an iterator, taken from it when they are first needed and then
+    kept, so they can be indexed and iterated more than once. Wrapped around
+    best_bids this is a list of all bids sorted on utility that is only
+    generated as far as it is used.
+    """
+
+    def __init__(self, items: Iterable[T]):
+        self._iterator = iter(items)
+        self._items: List[T] = []
+
+    def __getitem__(self, index: int) -> T:
+        if not self._fill(index):
+            raise IndexError(index)
+        return self._items[index]
+
+    def __iter__(self) -> Iterator[T]:
+        position = 0
+        while self._fill(position):
+            yield self._items[position]
+            position += 1
+
+    def _fill(self, position: int) -> bool:
+        """take items until the given position exists, False if there are fewer"""
+        while len(self._items) <= position:
+            item = next(self._iterator, _END)
+            if item is _END:
+                return False
+            self._items.append(item)
+        return True
+
+
+# marks the end of the iterator of a LazyList
+_END = object()
@@ -0,0 +1,122 @@
+import weakref
+from math import prod
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+from geniusweb.issuevalue.Bid import Bid
+from geniusweb.issuevalue.Value import Value
+from geniusweb.profile.utilityspace.LinearAdditive import LinearAdditive
+
+
+class CompiledProfile:
+    """
+    Float copy of a LinearAdditive profile for fast utility evaluation. Bids are
+    encoded as rows of integers (one value index per issue, issues sorted by
+    name) and the utility of a row is the sum of the weighted value utilities
+    that are gathered from a table with one row per issue. Values that are
+    missing from a bid (or unknown to the domain) point to a zero column, like
+    they add nothing to the utility in geniusweb.
+    """
+
+    def __init__(self, profile: LinearAdditive):
+        domain = profile.getDomain()
+        utilities = profile.getUtilities()
+
+        self._issues: List[str] = sorted(domain.getIssues())
+        self._values: List[List[Value]] = [
+            list(domain.getValues(issue)) for issue in self._issues
+        ]
+        self._value_index: List[Dict[Value, int]] = [
+            {value: i for i, value in enumerate(values)} for values in self._values
+        ]
+
+        # the last column of the table stays zero and is used for missing values
+        self._missing = max(len(values) for values in self._values)
+        self._table = np.zeros((len(self._issues), self._missing + 1))
+        for i, issue in enumerate(self._issues):
+            weight = profile.getWeight(issue)
+            for j, value in enumerate(self._values[i]):
+                self._table[i, j] = float(weight * utilities[issue].getUtility(value))
+        self._issue_range = np.arange(len(self._issues))
+
+    def issues(self) -> List[str]:
+        return self._issues
+
+    def values(self, issue_index: int) -> List[Value]:
+        return self._values[issue_index]
+
+    def table(self) -> np.ndarray:
+        """weighted utility table with shape (issues, max values + 1)"""
+        return self._table
+
+    def size(self) -> int:
+        """number of possible bids in the domain"""
+        return prod(len(values) for values in self._values)
+
+    def all_rows(self) -> np.ndarray:
+        """encode every bid of the domain, by decoding every bid number in mixed radix"""
+        radices = [len(values) for values in self._values]
+        dtype = np.min_scalar_type(self._missing)
+        rows = np.empty((self.size(), len(radices)), dtype=dtype)
+        remainder = np.arange(self.size())
+        for i in reversed(range(len(radices))):
+            rows[:, i] = remainder % radices[i]
+            remainder //= radices[i]
+        return rows
+
+    def encode(self, bid: Bid) -> np.ndarray:
+        return np.array(
+            [
+                self._value_index[i].get(bid.getValue(issue), self._missing)
+                for i, issue in enumerate(self._issues)
+            ],
+            dtype=np.int64,
+        )
+
+    def encode_bids(self, bids: Iterable[Bid]) -> np.ndarray:
+        """encode bids to an integer matrix with shape (bids, issues)"""
+        rows = [
+            [
+                self._value_index[i].get(bid.getValue(issue), self._missing)
+                for i, issue in enumerate(self._issues)
+            ]
+            for bid in bids
+        ]
+        return np.array(rows, dtype=np.int64).reshape(-1, len(self._issues))
+
+    def decode(self, row: Iterable[int]) -> Bid:
+        return Bid(
+            {
+                issue: self._values[i][j]
+                for i, (issue, j) in enumerate(zip(self._issues, row))
+                if j < len(self._values[i])
+            }
+        )
+
+    def utilities(self, rows: np.ndarray) -> np.ndarray:
+        """utilities of all encoded bids in one gather and sum"""
+        return self._table[self._issue_range, rows].sum(axis=1)
+
+    def utility(self, bid: Bid) -> float:
+        return float(self._table[self._issue_range, self.encode(bid)].sum())
+
+
+# compiled profiles by id of the profile object, with a weak reference to the profile
+_compiled: Dict[int, Tuple[weakref.ref, CompiledProfile]] = {}
+
+
+def compile_profile(profile: LinearAdditive) -> CompiledProfile:
+    """The CompiledProfile of a profile, built once per profile object. Profiles
+    from the profile cache are the same object in every session, so a profile
+    file is compiled once per process.
+    """
+    known = _compiled.get(id(profile))
+    if known is not None and known[0]() is profile:
+        return known[1]
+
+    compiled = CompiledProfile(profile)
+    _compiled[id(profile)] = (
+        weakref.ref(profile, lambda _, i=id(profile): _compiled.pop(i, None)),
+        compiled,
+    )
+    return compiled
@@ -0,0 +1,127 @@
+import logging
+import os
+from collections import OrderedDict, namedtuple
+from threading import Lock
+from typing import Optional
+
+from geniusweb.profile.Profile import Profile
+from geniusweb.profileconnection.ProfileConnectionFactory import (
+    ProfileConnectionFactory,
+)
+from geniusweb.profileconnection.ProfileInterface import ProfileInterface
+from tudelft_utilities_logging.Reporter import Reporter
+from uri.uri import URI
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class ProfileCache:
+    """
+    Process-wide cache of parsed profiles, keyed by profile URI and the
+    modification time of the profile file, so an edited profile is parsed again.
+    The least recently used profile is evicted when the cache is full. Only
+    file: URIs are cached, other URIs are always fetched.
+    """
+
+    def __init__(self, maxsize: int = 64):
+        self._maxsize = maxsize
+        self._profiles: "OrderedDict[tuple, Profile]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._lock = Lock()
+
+    def get(self, uri: str, reporter: Optional[Reporter] = None) -> Profile:
+        path = _file_path(uri)
+        if path is None:
+            return _load_profile(uri, reporter)
+
+        key = (uri, os.stat(path).st_mtime_ns)
+        with self._lock:
+            profile = self._profiles.get(key)
+            if profile is not None:
+                self._hits += 1
+                self._profiles.move_to_end(key)
+                return profile
+            self._misses += 1
+
+        profile = _load_profile(uri, reporter)
+
+        with self._lock:
+            self._profiles[key] = profile
+            self._profiles.move_to_end(key)
+            while len(self._profiles) > self._maxsize:
+                self._profiles.popitem(last=False)
+        return profile
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(self._hits, self._misses, self._maxsize, len(self._profiles))
+
+    def cache_clear(self):
+        with self._lock:
+            self._profiles.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+class CachedProfileConnection(ProfileInterface):
+    """
+    ProfileInterface for agents that takes the profile from the process-wide
+    cache instead of parsing the profile file again.
+    """
+
+    def __init__(self, uri: str, reporter: Optional[Reporter] = None):
+        self._uri = uri
+        self._reporter = reporter
+        self._profile: Optional[Profile] = None
+
+    def getProfile(self) -> Profile:
+        if self._profile is None:
+            self._profile = profile_cache.get(self._uri, self._reporter)
+        return self._profile
+
+    def close(self):
+        # the profile stays in the cache for other agents and sessions
+        self._profile = None
+
+
+# the cache that is shared by the runner and the agents in this process
+profile_cache = ProfileCache()
+
+
+def get_profile(uri: str) -> Profile:
+    return profile_cache.get(str(uri))
+
+
+def create_profile_connection(uri: URI, reporter: Reporter) -> ProfileInterface:
+    """Drop-in replacement for ProfileConnectionFactory.create that uses the
+    shared profile cache for profiles that are stored in files.
+    """
+    if _file_path(str(uri)) is None:
+        return ProfileConnectionFactory.create(uri, reporter)
+    return CachedProfileConnection(str(uri), reporter)
+
+
+def _file_path(uri: str) -> Optional[str]:
+    # only plain file uris, uris with a query do not refer to the file as is
+    if not uri.startswith("file:") or "?" in uri:
+        return None
+    return uri[len("file:") :]
+
+
+class _LoggingReporter(Reporter):
+    """Reports to the logger of this module, for profiles that are loaded
+    without a reporter (by the runner)
+    """
+
+    def log(self, level: int, msg: str, exc: Optional[BaseException] = None):
+        logging.getLogger(__name__).log(level, msg, exc_info=exc)
+
+
+def _load_profile(uri: str, reporter: Optional[Reporter]) -> Profile:
+    profile_connection = ProfileConnectionFactory.create(
+        URI(uri), reporter or _LoggingReporter()
+    )
+    try:
+        return profile_connection.getProfile()
+    finally:
+        profile_connection.close()
@@ -0,0 +1,107 @@
+import hashlib
+import json
+import os
+from functools import lru_cache
+from threading import Lock
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+
+from agents.common.compiled_profile import CompiledProfile
+
+# directory of the bid space that is shared by the workers of a tournament
+DEFAULT_DIRECTORY = "results/bidspace"
+
+
+class SharedBidSpace:
+    """
+    The encoded bids of a domain and the utility of every bid for a profile,
+    stored once as .npy files in a directory and memory mapped by every process
+    that needs them. All workers of a tournament map the same pages of the page
+    cache, so memory does not grow with the number of workers.
+
+    Layout of the directory, with content addressed keys (a hash of the issues
+    and values of the domain, and of the weighted utility table of the profile):
+
+        <domain>/rows.npy                 all bids (see CompiledProfile.all_rows),
+                                          the row index is the bid number
+        <domain>/<profile>/utilities.npy  utility of every bid, by bid number
+        <domain>/<profile>/order.npy      bid numbers on ascending utility (stable)
+        <domain>/<profile>/sorted.npy     utilities in that order
+
+    Files are written by the first process that needs them, to a temporary file
+    that is renamed, so processes that race to write the same file are safe.
+    The arrays are read-only.
+    """
+
+    def __init__(self, directory: str = DEFAULT_DIRECTORY):
+        self._directory = directory
+        # arrays that are mapped in this process, by path
+        self._arrays: Dict[str, np.ndarray] = {}
+        self._lock = Lock()
+
+    def rows(self, profile: CompiledProfile) -> np.ndarray:
+        """all bids of the domain of the profile, with shape (bids, issues)"""
+        return self._attach(
+            os.path.join(self._domain_directory(profile), "rows.npy"),
+            profile.all_rows,
+        )
+
+    def utilities(self, profile: CompiledProfile) -> np.ndarray:
+        """utility of every bid of the domain, by bid number"""
+        return self._attach(
+            os.path.join(self._profile_directory(profile), "utilities.npy"),
+            lambda: profile.utilities(self.rows(profile)),
+        )
+
+    def ascending(self, profile: CompiledProfile) -> Tuple[np.ndarray, np.ndarray]:
+        """bid numbers sorted on ascending utility, and their utilities"""
+        directory = self._profile_directory(profile)
+        order = self._attach(
+            os.path.join(directory, "order.npy"),
+            lambda: np.argsort(self.utilities(profile), kind="stable"),
+        )
+        utilities = self._attach(
+            os.path.join(directory, "sorted.npy"),
+            lambda: self.utilities(profile)[order],
+        )
+        return order, utilities
+
+    def _attach(self, path: str, build: Callable[[], np.ndarray]) -> np.ndarray:
+        with self._lock:
+            array = self._arrays.get(path)
+        if array is not None:
+            return array
+
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temporary = f"{path}.{os.getpid()}.tmp"
+            with open(temporary, "wb") as f:
+                np.save(f, build())
+            os.replace(temporary, path)
+        array = np.load(path, mmap_mode="r")
+
+        with self._lock:
+            return self._arrays.setdefault(path, array)
+
+    def _domain_directory(self, profile: CompiledProfile) -> str:
+        domain = [
+            [issue, [str(value) for value in profile.values(i)]]
+            for i, issue in enumerate(profile.issues())
+        ]
+        key = hashlib.sha1(json.dumps(domain).encode("utf-8")).hexdigest()
+        return os.path.join(self._directory, key)
+
+    def _profile_directory(self, profile: CompiledProfile) -> str:
+        key = hashlib.sha1(profile.table().tobytes()).hexdigest()
+        return os.path.join(self._domain_directory(profile), key)
+
+
+@lru_cache(maxsize=None)
+def get_bid_space(directory: str = DEFAULT_DIRECTORY) -> SharedBidSpace:
+    """the bid space of a directory, one per process so arrays are mapped once"""
+    return SharedBidSpace(directory)
+
+
+# the bid space that is shared by the agents of all sessions and workers
+shared_bid_space = get_bid_space()
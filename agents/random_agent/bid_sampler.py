@@ -0,0 +1,47 @@
+from random import randint
+from typing import List
+
+import numpy as np
+from geniusweb.issuevalue.Bid import Bid
+from geniusweb.profile.utilityspace.LinearAdditive import LinearAdditive
+
+from agents.common.compiled_profile import CompiledProfile
+
+
+class BidSampler:
+    """
+    Draws uniformly random bids from the domain of a profile.
+
+    Built once per session. A random bid number in [0, number of bids) is
+    decoded in mixed radix straight into one value per issue, so no
+    AllBidsList has to be created. Candidates can be drawn in batches, with
+    their utilities computed at once by the float-compiled profile.
+    """
+
+    def __init__(self, profile: LinearAdditive):
+        self._profile = CompiledProfile(profile)
+        self._radices: List[int] = [
+            len(self._profile.values(i)) for i in range(len(self._profile.issues()))
+        ]
+        self._size = self._profile.size()
+
+    def _decode(self, number: int) -> List[int]:
+        row = [0] * len(self._radices)
+        for i in reversed(range(len(self._radices))):
+            number, row[i] = divmod(number, self._radices[i])
+        return row
+
+    def sample(self) -> Bid:
+        """Returns a uniformly random bid"""
+        return self._profile.decode(self._decode(randint(0, self._size - 1)))
+
+    def sample_good(self, count: int, threshold: float) -> Bid:
+        """
+        Draws count random bids and returns the first one with a utility above the
+        threshold, or the last one drawn if none of them is good enough.
+        """
+        rows = np.array(
+            [self._decode(randint(0, self._size - 1)) for _ in range(count)]
+        )
+        good = np.flatnonzero(self._profile.utilities(rows) > threshold)
+        return self._profile.decode(rows[good[0] if len(good) else -1])
@@ -1,5 +1,4 @@
 import logging
-from random import randint
 import traceback
 from typing import cast, Dict, List, Set, Collection
 
@@ -10,7 +9,6 @@ from geniusweb.actions.Offer import Offer
 from geniusweb.actions.PartyId import PartyId
 from geniusweb.actions.Vote import Vote
 from geniusweb.actions.Votes import Votes
-from geniusweb.bidspace.AllBidsList import AllBidsList
 from geniusweb.inform.ActionDone import ActionDone
 from geniusweb.inform.Finished import Finished
 from geniusweb.inform.Inform import Inform
@@ -19,18 +17,17 @@ from geniusweb.inform.Settings import Settings
 from geniusweb.inform.Voting import Voting
 from geniusweb.inform.YourTurn import YourTurn
 from geniusweb.issuevalue.Bid import Bid
-from geniusweb.issuevalue.Domain import Domain
 from geniusweb.issuevalue.Value import Value
 from geniusweb.issuevalue.ValueSet import ValueSet
 from geniusweb.party.Capabilities import Capabilities
 from geniusweb.party.DefaultParty import DefaultParty
 from geniusweb.profile.utilityspace.UtilitySpace import UtilitySpace
-from geniusweb.profileconnection.ProfileConnectionFactory import (
-    ProfileConnectionFactory,
-)
 from geniusweb.progress.ProgressRounds import ProgressRounds
 from geniusweb.utils import val
 
+from agents.common.profile_cache import create_profile_connection
+from agents.random_agent.bid_sampler import BidSampler
+
 
 class RandomAgent(DefaultParty):
     """
@@ -42,6 +39,7 @@ class RandomAgent(DefaultParty):
         self.getReporter().log(logging.INFO, "party is initialized")
         self._profile = None
         self._lastReceivedBid: Bid = None
+        self._sampler: BidSampler = None
 
     # Override
     def notifyChange(self, info: Inform):
@@ -54,7 +52,7 @@ class RandomAgent(DefaultParty):
             if "Learn" == self._protocol:
                 self.getConnection().send(LearningDone(self._me))  # type:ignore
             else:
-                self._profile = ProfileConnectionFactory.create(
+                self._profile = create_profile_connection(
                     info.getProfile().getURI(), self.getReporter()
                 )
         elif isinstance(info, ActionDone):
@@ -101,10 +99,8 @@ class RandomAgent(DefaultParty):
         if self._isGood(self._lastReceivedBid):
             action = Accept(self._me, self._lastReceivedBid)
         else:
-            for _attempt in range(20):
-                bid = self._getRandomBid(self._profile.getProfile().getDomain())
-                if self._isGood(bid):
-                    break
+            # draw 20 random bids at once and offer the first good one (or the last one)
+            bid = self._getSampler().sample_good(20, 0.6)
             action = Offer(self._me, bid)
         self.getConnection().send(action)
 
@@ -116,9 +112,11 @@ class RandomAgent(DefaultParty):
             return profile.getUtility(bid) > 0.6
         raise Exception("Can not handle this type of profile")
 
-    def _getRandomBid(self, domain: Domain) -> Bid:
-        allBids = AllBidsList(domain)
-        return allBids.get(randint(0, allBids.size() - 1))
+    def _getSampler(self) -> BidSampler:
+        # the sampler is built once per session, on the first turn
+        if self._sampler == None:
+            self._sampler = BidSampler(self._profile.getProfile())
+        return self._sampler
 
     def _vote(self, voting: Voting) -> Votes:
         """
@@ -4,7 +4,6 @@ from typing import cast
 from geniusweb.actions.Accept import Accept
 from geniusweb.actions.Action import Action
 from geniusweb.actions.Offer import Offer
-from geniusweb.bidspace.AllBidsList import AllBidsList
 from geniusweb.inform.ActionDone import ActionDone
 from geniusweb.inform.Finished import Finished
 from geniusweb.inform.Inform import Inform
@@ -18,6 +17,10 @@ from geniusweb.profileconnection.ProfileConnectionFactory import (
 )
 from geniusweb.progress.ProgressRounds import ProgressRounds
 
+from agents.template_agent.compact_bid import BidCodec
+from agents.template_agent.opponent_model import OpponentModel
+from agents.template_agent.top_bids import best_bids
+
 class AgentBatGosho(DefaultParty):
     """
     Template agent that offers random bids until a bid with sufficient utility is offered.
@@ -30,6 +33,9 @@ class AgentBatGosho(DefaultParty):
         self._last_received_bid: Bid = None
         self.latest_bid: Bid = None
         self.all_bids = []
+        self.opponent_model: OpponentModel = None
+        # bids are kept as compact bids, and only converted to and from Bids when they are received or sent
+        self._codec: BidCodec = None
 
     def notifyChange(self, info: Inform):
         """This is the entry point of all interaction with your agent after is has been initialised.
@@ -114,7 +120,14 @@ class AgentBatGosho(DefaultParty):
             action = Offer(self._me, bid)
             self.latest_bid = bid
             if self._last_received_bid is not None:
-                self.all_bids.append((self._last_received_bid, profile.getUtility(self._last_received_bid)))
+                if self.opponent_model is None:
+                    # ties as in the original count: the value the opponent first bid most recently
+                    self.opponent_model = OpponentModel(profile.getDomain(), recent_ties=True)
+                    self._codec = BidCodec(profile.getDomain())
+                self.all_bids.append(
+                    (self._codec.encode(self._last_received_bid), profile.getUtility(self._last_received_bid))
+                )
+                self.opponent_model.update(self._last_received_bid)
 
         # send the action
         self.getConnection().send(action)
@@ -181,16 +194,7 @@ class AgentBatGosho(DefaultParty):
         return bid
 
     def get_highest_bid(self):
-        domain = self._profile.getProfile().getDomain()
-        all_bids = AllBidsList(domain)
-
-        bids_with_utility = []
-
-        for bid in all_bids:
-            bids_with_utility.append((bid, self._profile.getProfile().getUtility(bid)))
-
-        bids_with_utility = sorted(bids_with_utility, key=lambda item: -item[1])
-        return bids_with_utility[0][0]
+        return next(best_bids(self._profile.getProfile()))[0]
 
     def search_for_value(self, val, issue):
         max_val = 1
@@ -205,30 +209,11 @@ class AgentBatGosho(DefaultParty):
         return desired_value
 
     def get_opponent_info(self):
-        prev_bids = self.all_bids
-
-        if len(prev_bids) < 10:
+        if self.opponent_model is None or self.opponent_model.bid_count() < 10:
             return None
 
-        # prev_bids.sort(key=lambda x: x[1])
-        issues = self._last_received_bid.getIssues()
-
-        demanded_best_offer = {}
-        for issue in issues:
-            issue_value_opponent = {}
-            for i in range(len(prev_bids)):
-                bid = prev_bids[i][0]
-                val = bid.getValue(issue)
-                if val in issue_value_opponent:
-                    issue_value_opponent[val] = issue_value_opponent[val] + 1
-                else:
-                    issue_value_opponent[val] = 1
-
-            sorted_dict = dict(sorted(issue_value_opponent.items(), key=lambda item: item[1]))
-            opponent_val = list(sorted_dict.keys())[-1]
-            demanded_best_offer[issue] = opponent_val
-
-        return demanded_best_offer
+        # the opponent model keeps the most occurring value for each issue up to date
+        return self.opponent_model.preferred_bid()
 
     def not_important_issues(self):
         domain = self._profile.getProfile().getDomain()
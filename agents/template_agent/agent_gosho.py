@@ -1,4 +1,5 @@
 import logging
+from collections import deque
 from typing import cast
 from math import *
 
@@ -19,6 +20,10 @@ from geniusweb.profileconnection.ProfileConnectionFactory import (
 )
 from geniusweb.progress.ProgressRounds import ProgressRounds
 
+from agents.template_agent.compact_bid import BidCodec
+from agents.template_agent.opponent_model import OpponentModel
+from agents.template_agent.top_bids import LazyList, best_bids
+
 class AgentGosho(DefaultParty):
     """
     Template agent that offers random bids until a bid with sufficient utility is offered.
@@ -32,9 +37,15 @@ class AgentGosho(DefaultParty):
         self.latest_bid: Bid = None
         self.all_bids = []
         self.opponent_preferences = []
-        self.opponent_value_count = {}
+        self.opponent_model: OpponentModel = None
         self.all_good_bids = []
-        self.all_previously_offered_bids = []
+        self.all_previously_offered_bids = deque()
+        self.previously_offered = None
+        self.suitable_bid_cursor = 0
+        self.all_available_bids_sorted = None
+        # bids are kept as compact bids, and only converted to and from Bids when they are received or sent,
+        # our own bids as their position in the sorted bids
+        self._codec: BidCodec = None
         self.not_important_issues = []
         self.middle_issues = []
 
@@ -108,9 +119,7 @@ class AgentGosho(DefaultParty):
         return "Group 27 agent for Collaborative AI course"
 
     def update_opponent_counts(self):
-        lrb = self._last_received_bid
-        for issue in lrb.getIssues():
-            self.opponent_value_count[issue][lrb.getValue(issue)] += 1
+        self.opponent_model.update(self._last_received_bid)
 
     # execute a turn
     def _myTurn(self):
@@ -121,18 +130,25 @@ class AgentGosho(DefaultParty):
 
             self.get_not_important_issues()
 
-            issues = profile.getDomain().getIssues()
-            for issue in issues:
-                self.opponent_value_count[issue] = {}
-                for value in profile.getDomain().getValues(issue):
-                    self.opponent_value_count[issue][value] = 0
+            self.opponent_model = OpponentModel(profile.getDomain())
+            self._codec = BidCodec(profile.getDomain())
+
+            # all bids sorted on utility, generated best first as far as they are used
+            self.all_available_bids_sorted = LazyList(
+                (self._codec.encode(bid), utility) for bid, utility in best_bids(profile)
+            )
+            # positions in the sorted bids of the bids we offered
+            self.previously_offered = set()
+            self.suitable_bid_cursor = 0
 
 
         if self._last_received_bid is not None:
             # We update the count for each value for each issue of our opponent
             self.update_opponent_counts()
             # We update the list of all issues sent by our opponent
-            self.all_bids.append((self._last_received_bid, profile.getUtility(self._last_received_bid)))
+            self.all_bids.append(
+                (self._codec.encode(self._last_received_bid), profile.getUtility(self._last_received_bid))
+            )
 
         if self._isGood(self._last_received_bid):
             # if so, accept the offer
@@ -193,53 +209,50 @@ class AgentGosho(DefaultParty):
 
         for bid in all_bids:
             if self._isGood(bid):
-                self.all_good_bids.append(bid)
+                self.all_good_bids.append(self._codec.encode(bid))
 
     def _findBid(self) -> Bid:
-        bid_offer = None
-        for bid, _ in self.get_all_suitable_bids():
-            if bid not in self.all_previously_offered_bids:
-                self.all_previously_offered_bids.append(bid)
-                bid_offer = bid
-                break
-
-        if bid_offer is None:
+        position = self.get_suitable_bid()
+        if position is not None:
+            self.previously_offered.add(position)
+            self.all_previously_offered_bids.append(position)
+            bid = self._codec.decode(self.all_available_bids_sorted[position][0])
+        else:
             # When we have not offered a bid, offer highest preference
             if len(self.all_previously_offered_bids) == 0:
                 bid = self.get_highest_bid()
             else:
                 # since no new good offers are available, start offering what we have already offered before
                 # (starting from the best available offers)
-                bid = self.all_previously_offered_bids.pop(0)
-                self.all_previously_offered_bids.append(bid)
+                position = self.all_previously_offered_bids.popleft()
+                self.all_previously_offered_bids.append(position)
+                bid = self._codec.decode(self.all_available_bids_sorted[position][0])
                 print('oki')
-        else:
-            bid = bid_offer
         print("Bid utility------------", self._profile.getProfile().getUtility(bid))
 
         return bid
 
-    def get_all_suitable_bids(self):
-        domain = self._profile.getProfile().getDomain()
-        all_bids = AllBidsList(domain)
-
+    def get_suitable_bid(self):
+        # returns the position in the sorted bids of the best good bid we did not offer yet, or None
         opponent_desired_bid = self.get_opponent_info_good()
-        not_important_issues = self.not_important_issues
 
-        bids_with_utility = []
+        # without a model of the opponent, only make an offer when no issue is unimportant to us
+        if opponent_desired_bid is None and len(self.not_important_issues) > 0:
+            return None
 
-        for bid in all_bids:
-            counter = 0
-            if opponent_desired_bid is not None:
-                for not_important_issue in not_important_issues:
-                    if bid.getIssueValues().get(not_important_issue) == opponent_desired_bid.get(not_important_issue):
-                        counter += 1
-            
-            if (opponent_desired_bid is not None or counter == len(not_important_issues)) and self._isGood(bid):
-                bids_with_utility.append((bid, self._profile.getProfile().getUtility(bid)))
-
-        bids_with_utility = sorted(bids_with_utility, key=lambda item: -item[1])
-        return bids_with_utility
+        # skip the bids we offered before, starting where the previous scan stopped; the cursor only moves
+        # forward, so a whole session costs at most one pass over the bids
+        while self.suitable_bid_cursor in self.previously_offered:
+            self.suitable_bid_cursor += 1
+        try:
+            bid, _ = self.all_available_bids_sorted[self.suitable_bid_cursor]
+        except IndexError:
+            return None
+
+        # the bids are sorted on utility, so once a bid is not good none of the remaining bids are
+        if self._isGood(self._codec.decode(bid)):
+            return self.suitable_bid_cursor
+        return None
 
     def is_opponent_repeating_bids(self):
         if len(self.all_bids) >= 5:
@@ -250,16 +263,7 @@ class AgentGosho(DefaultParty):
         return False
 
     def get_highest_bid(self):
-        domain = self._profile.getProfile().getDomain()
-        all_bids = AllBidsList(domain)
-
-        bids_with_utility = []
-
-        for bid in all_bids:
-            bids_with_utility.append((bid, self._profile.getProfile().getUtility(bid)))
-
-        bids_with_utility = sorted(bids_with_utility, key=lambda item: -item[1])
-        return bids_with_utility[0][0]
+        return next(best_bids(self._profile.getProfile()))[0]
 
     def search_for_value(self, suggeseted_value_utility, issue):
         max_val = 1
@@ -275,7 +279,7 @@ class AgentGosho(DefaultParty):
         return desired_value
 
     def get_opponent_preference(self):
-        first_bid = self.all_bids[0][0]
+        first_bid = self._codec.decode(self.all_bids[0][0])
 
         for issue in first_bid.getIssues():
             self.opponent_preferences.append((issue, first_bid.getValue(issue)))
@@ -293,7 +297,7 @@ class AgentGosho(DefaultParty):
             issue_value_opponent = {}
             for i in range(len(prev_bids)):
                 bid = prev_bids[i][0]
-                val = bid.getValue(issue)
+                val = self._codec.value(bid, issue)
                 if val in issue_value_opponent:
                     issue_value_opponent[val] = issue_value_opponent[val] + 1
                 else:
@@ -312,19 +316,8 @@ class AgentGosho(DefaultParty):
         if len(self.all_bids) < 2:
             return None
 
-        issues = self._profile.getProfile().getDomain().getIssues()
-
-        opponent_counts = self.opponent_value_count
-        demanded_best_offer = {}
-
-        # For each issue, sort by the number of occurrences of each value and take the highest
-        for issue in issues:
-            opponent_values = opponent_counts[issue]
-            sorted_dict = dict(sorted(opponent_values.items(), key=lambda item: item[1]))
-            opponent_val = list(sorted_dict.keys())[-1]
-            demanded_best_offer[issue] = opponent_val
-
-        return demanded_best_offer
+        # The opponent model keeps the most occurring value for each issue up to date
+        return self.opponent_model.preferred_bid()
 
     def get_not_important_issues(self):
         domain = self._profile.getProfile().getDomain()
@@ -0,0 +1,68 @@
+from math import prod
+from typing import Dict, List, Optional
+
+from geniusweb.issuevalue.Bid import Bid
+from geniusweb.issuevalue.Domain import Domain
+from geniusweb.issuevalue.Value import Value
+
+
+class CompactBid(int):
+    """
+    A bid packed into one integer: the index of the value of every issue (issues
+    sorted by name) as a digit in mixed radix, the first issue being the most
+    significant. Every issue has one extra digit for a missing value.
+
+    Equality and hashing are those of the int, so comparing bids or looking them
+    up in a list or set does not compare dicts of values, and a bid takes the
+    memory of a small int. Bids are converted with the BidCodec of the domain,
+    only where they are received from or sent to the protocol.
+    """
+
+    __slots__ = ()
+
+
+class BidCodec:
+    """
+    Converts between geniusweb Bids and CompactBids of a domain. Values that
+    are not in the domain are encoded as missing.
+    """
+
+    def __init__(self, domain: Domain):
+        self._issues: List[str] = sorted(domain.getIssues())
+        self._issue_index: Dict[str, int] = {
+            issue: i for i, issue in enumerate(self._issues)
+        }
+        self._values: List[List[Value]] = [
+            list(domain.getValues(issue)) for issue in self._issues
+        ]
+        self._value_index: List[Dict[Value, int]] = [
+            {value: i for i, value in enumerate(values)} for values in self._values
+        ]
+        # the last digit of every issue stands for a missing value
+        self._radices = [len(values) + 1 for values in self._values]
+        self._strides = [prod(self._radices[i + 1 :]) for i in range(len(self._issues))]
+
+    def encode(self, bid: Bid) -> CompactBid:
+        number = 0
+        for i, issue in enumerate(self._issues):
+            missing = self._radices[i] - 1
+            digit = self._value_index[i].get(bid.getValue(issue), missing)
+            number = number * self._radices[i] + digit
+        return CompactBid(number)
+
+    def decode(self, bid: CompactBid) -> Bid:
+        values = {}
+        for i, issue in enumerate(self._issues):
+            value = self._digit_value(i, bid)
+            if value is not None:
+                values[issue] = value
+        return Bid(values)
+
+    def value(self, bid: CompactBid, issue: str) -> Optional[Value]:
+        """The value of an issue in the bid, None if it is missing"""
+        i = self._issue_index.get(issue)
+        return None if i is None else self._digit_value(i, bid)
+
+    def _digit_value(self, i: int, bid: CompactBid) -> Optional[Value]:
+        digit = bid // self._strides[i] % self._radices[i]
+        return self._values[i][digit] if digit < len(self._values[i]) else None
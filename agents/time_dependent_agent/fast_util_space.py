@@ -0,0 +1,176 @@
+from decimal import Decimal
+from typing import List, Optional
+
+import numpy as np
+from geniusweb.issuevalue.Bid import Bid
+from geniusweb.profile.utilityspace.LinearAdditive import LinearAdditive
+from tudelft.utilities.immutablelist.AbstractImmutableList import (
+    AbstractImmutableList,
+)
+from tudelft.utilities.immutablelist.ImmutableList import ImmutableList
+
+from agents.common.compiled_profile import CompiledProfile
+from agents.common.shared_bid_space import SharedBidSpace, shared_bid_space
+
+
+class FastExtendedUtilSpace:
+    """
+    Alternative backend for {@link ExtendedUtilSpace} with the same API.
+
+    The utilities of all bids are computed once into a float array that is
+    sorted on utility, next to the encoded bids. A call to getBids is then a
+    binary search for the bid ids inside the interval, and the bids are only
+    created when they are taken from the returned list. Min, max and tolerance
+    are computed exactly as in ExtendedUtilSpace.
+
+    The *Float methods give the same information in floats, for agents that
+    run their whole strategy in floats.
+    """
+
+    # margin for the float utilities on the interval bounds
+    _EPSILON = 1e-14
+
+    def __init__(
+        self, space: LinearAdditive, bidspace: Optional[SharedBidSpace] = None
+    ):
+        """
+        @param space    the profile
+        @param bidspace optional shared bid space to map the bids and sorted
+                        utilities from, instead of building them in this process
+        """
+        self._utilspace = space
+        self._profile = CompiledProfile(space)
+
+        # bid id i is the bid in row self._order[i], with utility self._utilities[i]
+        if bidspace is not None:
+            self._rows = bidspace.rows(self._profile)
+            self._order, self._utilities = bidspace.ascending(self._profile)
+        else:
+            self._rows = self._profile.all_rows()
+            utilities = self._profile.utilities(self._rows)
+            self._order = np.argsort(utilities, kind="stable")
+            self._utilities = utilities[self._order]
+
+        self._computeMinMax()
+        self._tolerance = self._computeTolerance()
+        self._minFloat = float(self._minUtil)
+        self._maxFloat = float(self._maxUtil)
+        self._toleranceFloat = float(self._tolerance)
+
+    def _weightedUtils(self, issue: str) -> List[Decimal]:
+        utilities = self._utilspace.getUtilities()[issue]
+        weight = self._utilspace.getWeight(issue)
+        return [
+            weight * utilities.getUtility(value)
+            for value in self._utilspace.getDomain().getValues(issue)
+        ]
+
+    def _computeMinMax(self):
+        """
+        Computes the fields minutil and maxUtil, from the best and worst value
+        of every issue.
+        """
+        self._minUtil = Decimal(0)
+        self._maxUtil = Decimal(0)
+        for issue in self._profile.issues():
+            values = self._weightedUtils(issue)
+            self._minUtil += min(values)
+            self._maxUtil += max(values)
+
+        rvbid = self._utilspace.getReservationBid()
+        if rvbid != None:
+            rv = self._utilspace.getUtility(rvbid)
+            if rv > self._minUtil:
+                self._minUtil = rv
+
+    def _computeTolerance(self) -> Decimal:
+        """
+        @return the minimum tolerance required, which is the minimum difference
+                between the weighted utility of the best and one-but-best issue
+                value.
+        """
+        tolerance = Decimal(1)
+        for issue in self._profile.issues():
+            values = sorted(self._weightedUtils(issue), reverse=True)
+            if len(values) > 1:
+                tolerance = min(tolerance, values[0] - values[1])
+        return tolerance
+
+    def getMin(self) -> Decimal:
+        return self._minUtil
+
+    def getMax(self) -> Decimal:
+        return self._maxUtil
+
+    def getTolerance(self) -> Decimal:
+        return self._tolerance
+
+    def getMinFloat(self) -> float:
+        return self._minFloat
+
+    def getMaxFloat(self) -> float:
+        return self._maxFloat
+
+    def getUtilityFloat(self, bid: Bid) -> float:
+        return self._profile.utility(bid)
+
+    def getBidIds(self, utilityGoal: Decimal) -> range:
+        """
+        @param utilityGoal the requested utility
+        @return ids of the bids with utility inside [utilitygoal-{@link #tolerance},
+                utilitygoal]
+        """
+        return self._bidIdsBetween(
+            float(utilityGoal - self._tolerance), float(utilityGoal)
+        )
+
+    def getBid(self, bidId: int) -> Bid:
+        return self._profile.decode(self._rows[self._order[bidId]])
+
+    def getBids(self, utilityGoal: Decimal) -> ImmutableList[Bid]:
+        """
+        @param utilityGoal the requested utility
+        @return bids with utility inside [utilitygoal-{@link #tolerance},
+                utilitygoal]
+        """
+        return _BidsInRange(self, self.getBidIds(utilityGoal))
+
+    def getBidsFloat(self, utilityGoal: float) -> ImmutableList[Bid]:
+        """
+        @param utilityGoal the requested utility
+        @return bids with utility inside [utilitygoal-{@link #tolerance},
+                utilitygoal]
+        """
+        bidIds = self._bidIdsBetween(utilityGoal - self._toleranceFloat, utilityGoal)
+        return _BidsInRange(self, bidIds)
+
+    def _bidIdsBetween(self, low: float, high: float) -> range:
+        start = int(np.searchsorted(self._utilities, low - self._EPSILON, side="left"))
+        stop = int(np.searchsorted(self._utilities, high + self._EPSILON, side="right"))
+        return range(start, stop)
+
+
+class SharedFastExtendedUtilSpace(FastExtendedUtilSpace):
+    """
+    FastExtendedUtilSpace that maps its bids and sorted utilities from the
+    shared bid space, so all worker processes of a tournament share one copy.
+    """
+
+    def __init__(self, space: LinearAdditive):
+        super().__init__(space, shared_bid_space)
+
+
+class _BidsInRange(AbstractImmutableList[Bid]):
+    """
+    Bids of a FastExtendedUtilSpace with ids in a range, created on access.
+    """
+
+    def __init__(self, space: FastExtendedUtilSpace, bidIds: range):
+        self._space = space
+        self._bidIds = bidIds
+
+    def get(self, index: int) -> Bid:
+        return self._space.getBid(self._bidIds[index])
+
+    def size(self) -> int:
+        return len(self._bidIds)
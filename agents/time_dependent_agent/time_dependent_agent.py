@@ -1,7 +1,7 @@
 import logging
 from random import randint, random
 import traceback
-from typing import cast, Dict, List, Set, Collection
+from typing import cast, Dict, List, Set, Collection, Union
 
 from geniusweb.actions.Accept import Accept
 from geniusweb.actions.Action import Action
@@ -25,9 +25,6 @@ from geniusweb.issuevalue.ValueSet import ValueSet
 from geniusweb.party.Capabilities import Capabilities
 from geniusweb.party.DefaultParty import DefaultParty
 from geniusweb.profile.utilityspace.UtilitySpace import UtilitySpace
-from geniusweb.profileconnection.ProfileConnectionFactory import (
-    ProfileConnectionFactory,
-)
 from geniusweb.progress.ProgressRounds import ProgressRounds
 from geniusweb.utils import val
 from geniusweb.profileconnection.ProfileInterface import ProfileInterface
@@ -38,7 +35,13 @@ from time import sleep, time as clock
 from decimal import Decimal
 import sys
 from agents.time_dependent_agent.extended_util_space import ExtendedUtilSpace
+from agents.time_dependent_agent.fast_util_space import (
+    FastExtendedUtilSpace,
+    SharedFastExtendedUtilSpace,
+)
+from agents.time_dependent_agent.util_space_cache import util_space_cache
 from tudelft_utilities_logging.Reporter import Reporter
+from agents.common.profile_cache import create_profile_connection
 
 
 class TimeDependentAgent(DefaultParty):
@@ -67,6 +70,30 @@ class TimeDependentAgent(DefaultParty):
     infinity.</td>
     </tr>
 
+    <tr>
+    <td>fastspace</td>
+    <td>If true, bids are looked up in a {@link FastExtendedUtilSpace} that
+    precomputes all bid utilities as floats, instead of in an
+    {@link ExtendedUtilSpace}. Default value is false.</td>
+    </tr>
+
+    <tr>
+    <td>floatmode</td>
+    <td>If true, the concession curve, the acceptance check and the bid lookup
+    are all done in floats, using the float copy of the profile in a
+    {@link FastExtendedUtilSpace} (implies fastspace). Decisions are the same as
+    with Decimals, up to float rounding (see tests/test_floatmode.py). Default
+    value is false.</td>
+    </tr>
+
+    <tr>
+    <td>sharedspace</td>
+    <td>If true, the {@link FastExtendedUtilSpace} maps its bids and sorted
+    utilities from the bid space that is shared by all worker processes of a
+    tournament (see agents.common.shared_bid_space), instead of building them
+    in every process (implies fastspace). Default value is false.</td>
+    </tr>
+
     <tr>
     <td>delay</td>
     <td>The average time in seconds to wait before responding to a YourTurn. The
@@ -86,8 +113,13 @@ class TimeDependentAgent(DefaultParty):
         self._me: PartyId = None  # type:ignore
         self._progress: Progress = None  # type:ignore
         self._lastReceivedBid: Bid = None  # type:ignore
-        self._extendedspace: ExtendedUtilSpace = None  # type:ignore
+        self._extendedspace: Union[
+            ExtendedUtilSpace, FastExtendedUtilSpace
+        ] = None  # type:ignore
         self._e: float = 1.2
+        self._fastspace: bool = False
+        self._floatmode: bool = False
+        self._sharedspace: bool = False
         self._lastvotes: Votes = None  # type:ignore
         self._settings: Settings = None  # type:ignore
         self.getReporter().log(logging.INFO, "party is initialized")
@@ -115,11 +147,41 @@ class TimeDependentAgent(DefaultParty):
                             logging.WARNING,
                             "parameter e should be Double but found " + str(newe),
                         )
+                fastspace = self._settings.getParameters().get("fastspace")
+                if fastspace != None:
+                    if isinstance(fastspace, bool):
+                        self._fastspace = fastspace
+                    else:
+                        self.getReporter().log(
+                            logging.WARNING,
+                            "parameter fastspace should be Boolean but found "
+                            + str(fastspace),
+                        )
+                floatmode = self._settings.getParameters().get("floatmode")
+                if floatmode != None:
+                    if isinstance(floatmode, bool):
+                        self._floatmode = floatmode
+                    else:
+                        self.getReporter().log(
+                            logging.WARNING,
+                            "parameter floatmode should be Boolean but found "
+                            + str(floatmode),
+                        )
+                sharedspace = self._settings.getParameters().get("sharedspace")
+                if sharedspace != None:
+                    if isinstance(sharedspace, bool):
+                        self._sharedspace = sharedspace
+                    else:
+                        self.getReporter().log(
+                            logging.WARNING,
+                            "parameter sharedspace should be Boolean but found "
+                            + str(sharedspace),
+                        )
                 protocol: str = str(self._settings.getProtocol().getURI())
                 if "Learn" == protocol:
                     val(self.getConnection()).send(LearningDone(self._me))
                 else:
-                    self._profileint = ProfileConnectionFactory.create(
+                    self._profileint = create_profile_connection(
                         self._settings.getProfile().getURI(), self.getReporter()
                     )
 
@@ -211,8 +273,7 @@ class TimeDependentAgent(DefaultParty):
         myAction: Action
         if bid == None or (
             self._lastReceivedBid != None
-            and self._utilspace.getUtility(self._lastReceivedBid)
-            >= self._utilspace.getUtility(bid)
+            and self._getUtility(self._lastReceivedBid) >= self._getUtility(bid)
         ):
             # if bid==null we failed to suggest next bid.
             myAction = Accept(self._me, self._lastReceivedBid)
@@ -222,9 +283,22 @@ class TimeDependentAgent(DefaultParty):
 
     def _updateUtilSpace(self) -> LinearAdditive:  # throws IOException
         newutilspace = self._profileint.getProfile()
-        if not newutilspace == self._utilspace:
+        # the profile is usually the same object, which saves comparing it
+        if newutilspace is not self._utilspace and not newutilspace == self._utilspace:
             self._utilspace = cast(LinearAdditive, newutilspace)
-            self._extendedspace = ExtendedUtilSpace(self._utilspace)
+            # spaces are shared with other agents and sessions that use an equal profile
+            if self._sharedspace:
+                self._extendedspace = util_space_cache.get(
+                    SharedFastExtendedUtilSpace, self._utilspace
+                )
+            elif self._fastspace or self._floatmode:
+                self._extendedspace = util_space_cache.get(
+                    FastExtendedUtilSpace, self._utilspace
+                )
+            else:
+                self._extendedspace = util_space_cache.get(
+                    ExtendedUtilSpace, self._utilspace
+                )
         return self._utilspace
 
     def _makeBid(self) -> Bid:
@@ -234,16 +308,30 @@ class TimeDependentAgent(DefaultParty):
         """
         time = self._progress.get(round(clock() * 1000))
 
-        utilityGoal = self._getUtilityGoal(
-            time,
-            self.getE(),
-            self._extendedspace.getMin(),
-            self._extendedspace.getMax(),
-        )
-        options: ImmutableList[Bid] = self._extendedspace.getBids(utilityGoal)
-        if options.size() == 0:
-            # if we can't find good bid, get max util bid....
-            options = self._extendedspace.getBids(self._extendedspace.getMax())
+        if self._floatmode:
+            utilityGoal = self._getUtilityGoalFloat(
+                time,
+                self.getE(),
+                self._extendedspace.getMinFloat(),
+                self._extendedspace.getMaxFloat(),
+            )
+            options: ImmutableList[Bid] = self._extendedspace.getBidsFloat(utilityGoal)
+            if options.size() == 0:
+                # if we can't find good bid, get max util bid....
+                options = self._extendedspace.getBidsFloat(
+                    self._extendedspace.getMaxFloat()
+                )
+        else:
+            utilityGoal = self._getUtilityGoal(
+                time,
+                self.getE(),
+                self._extendedspace.getMin(),
+                self._extendedspace.getMax(),
+            )
+            options = self._extendedspace.getBids(utilityGoal)
+            if options.size() == 0:
+                # if we can't find good bid, get max util bid....
+                options = self._extendedspace.getBids(self._extendedspace.getMax())
         # pick a random one.
         return options.get(randint(0, options.size() - 1))
 
@@ -267,6 +355,26 @@ class TimeDependentAgent(DefaultParty):
             ft1 = round(Decimal(1 - pow(t, 1 / e)), 6)  # defaults ROUND_HALF_UP
         return max(min((minUtil + (maxUtil - minUtil) * ft1), maxUtil), minUtil)
 
+    def _getUtilityGoalFloat(
+        self, t: float, e: float, minUtil: float, maxUtil: float
+    ) -> float:
+        """
+        Float version of {@link #_getUtilityGoal}, used in float mode.
+        """
+        ft1 = 1.0
+        if e != 0:
+            ft1 = round(1 - pow(t, 1 / e), 6)
+        return max(min((minUtil + (maxUtil - minUtil) * ft1), maxUtil), minUtil)
+
+    def _getUtility(self, bid: Bid) -> Union[Decimal, float]:
+        """
+        @param bid the bid to evaluate
+        @return the utility of the bid in our profile, a float in float mode
+        """
+        if self._floatmode:
+            return self._extendedspace.getUtilityFloat(bid)
+        return self._utilspace.getUtility(bid)
+
     def _vote(self, voting: Voting) -> Votes:  # throws IOException
         """
         @param voting the {@link Voting} object containing the options
@@ -294,9 +402,16 @@ class TimeDependentAgent(DefaultParty):
         """
         if bid == None or self._profileint == None:
             return False
+        time = self._progress.get(round(clock() * 1000))
+        if self._floatmode:
+            return self._getUtility(bid) >= self._getUtilityGoalFloat(
+                time,
+                self.getE(),
+                self._extendedspace.getMinFloat(),
+                self._extendedspace.getMaxFloat(),
+            )
         profile = cast(LinearAdditive, self._profileint.getProfile())
         # the profile MUST contain UtilitySpace
-        time = self._progress.get(round(clock() * 1000))
         return profile.getUtility(bid) >= self._getUtilityGoal(
             time,
             self.getE(),
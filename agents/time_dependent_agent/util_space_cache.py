@@ -0,0 +1,91 @@
+import hashlib
+import json
+import weakref
+from collections import OrderedDict, namedtuple
+from threading import Lock
+from typing import Callable, Dict, Tuple, TypeVar
+
+from geniusweb.profile.utilityspace.LinearAdditive import LinearAdditive
+from pyson.ObjectMapper import ObjectMapper
+
+S = TypeVar("S")
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class UtilSpaceCache:
+    """
+    Process-wide cache of built extended util spaces, so the same profile is
+    indexed only once, no matter how many sessions or agents use it.
+
+    The cache is content addressed: spaces are stored under a fingerprint of the
+    serialized profile (and the class of the space), so equal profiles that are
+    parsed separately share one space. The least recently used space is evicted
+    when the cache is full.
+    """
+
+    def __init__(self, maxsize: int = 32):
+        self._maxsize = maxsize
+        self._spaces: "OrderedDict[Tuple[str, str], object]" = OrderedDict()
+        # fingerprints of the profile objects we have seen, by object id
+        self._fingerprints: Dict[int, Tuple[weakref.ref, str]] = {}
+        self._hits = 0
+        self._misses = 0
+        self._lock = Lock()
+
+    def get(
+        self, spaceClass: Callable[[LinearAdditive], S], profile: LinearAdditive
+    ) -> S:
+        """
+        @param spaceClass the class of the space, e.g. ExtendedUtilSpace
+        @param profile    the profile to build the space for
+        @return the cached space for an equal profile, built if necessary
+        """
+        key = (spaceClass.__qualname__, self.fingerprint(profile))
+        with self._lock:
+            space = self._spaces.get(key)
+            if space is not None:
+                self._hits += 1
+                self._spaces.move_to_end(key)
+                return space
+            self._misses += 1
+
+        space = spaceClass(profile)
+
+        with self._lock:
+            self._spaces[key] = space
+            self._spaces.move_to_end(key)
+            while len(self._spaces) > self._maxsize:
+                self._spaces.popitem(last=False)
+        return space
+
+    def fingerprint(self, profile: LinearAdditive) -> str:
+        """
+        @return SHA-1 of the serialized profile, computed once per profile object
+        """
+        known = self._fingerprints.get(id(profile))
+        if known is not None and known[0]() is profile:
+            return known[1]
+
+        serialized = json.dumps(ObjectMapper().toJson(profile), sort_keys=True)
+        fingerprint = hashlib.sha1(serialized.encode("utf-8")).hexdigest()
+        self._fingerprints[id(profile)] = (
+            weakref.ref(
+                profile, lambda _, i=id(profile): self._fingerprints.pop(i, None)
+            ),
+            fingerprint,
+        )
+        return fingerprint
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(self._hits, self._misses, self._maxsize, len(self._spaces))
+
+    def cache_clear(self):
+        with self._lock:
+            self._spaces.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+# the cache that is shared by all time dependent agents in this process
+util_space_cache = UtilSpaceCache()
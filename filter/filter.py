@@ -1,59 +1,69 @@
-import json
-
-json_files = [
-            'results/results_summaries.json',
-            #'results/initial.json',
-            #'results/initial1.json',
-            #'results/marko1.json',
-            #'results/nov1.json',
-            #'results/nov2.json',
-        ]
-
-data = []
-for json_file_name in json_files:
-    with open(json_file_name) as json_file:
-        data = data + json.load(json_file)
-        json_file.close()
-
-print(data)
-# first only get results relevant for agent gosho
-
-no_offer_accepted = 0
-relevant_negotiation_results = []
-for negotiation_result in data:
-    for key, value in negotiation_result.items():
-        if key.startswith('agent_') and value == 'AgentGoshoAscended':
-            relevant_negotiation_results.append(negotiation_result)
-            if negotiation_result['result'] != 'agreement':
-                no_offer_accepted += 1
-            break
-
-print(no_offer_accepted)
-print(data == relevant_negotiation_results)
-
-relevant_negotiation_results_agents_parsed = []
-
-for relevant_negotiation_result in relevant_negotiation_results:
-    agent = 0
-    utility = 0
-    entry = {}
-    for key, value in relevant_negotiation_result.items():
-        if key.startswith('agent_') and agent == 0:
-            entry["agent_1"] = value
-            agent += 1
-        elif key.startswith('agent_') and agent == 1:
-            entry["agent_2"] = value
-        elif key.startswith("utility_") and utility == 0:
-            entry["utility_1"] = value
-            utility += 1
-        elif key.startswith("utility_") and utility == 1:
-            entry["utility_2"] = value
-        else:
-            entry[key] = value
-    relevant_negotiation_results_agents_parsed.append(entry)
-
-print(relevant_negotiation_results_agents_parsed)
-
-with open('results/results_filtered.json', 'w') as outfile:
-    json.dump(relevant_negotiation_results_agents_parsed, outfile)
-    outfile.close()
+import argparse
+import os
+import sys
+import tempfile
+
+# make the utils package importable when this script is run as filter/filter.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.analytics import agent_report, agent_statistics, head_to_head
+from utils.result_store import ResultStore, build_store, stored_sessions
+from utils.result_writer import ResultsWriter
+
+# Analyse the results of a tournament:
+#   Prints the statistics of every agent (utility, agreement rate, nash product, social welfare) and a head-to-head
+#   matrix. With an agent name it also prints the report of that agent against every opponent and on every domain,
+#   and writes its sessions (with the keys normalised to agent_1, agent_2, utility_1 and utility_2) to a json file.
+#
+#   python filter/filter.py                                               report from results/results_store
+#   python filter/filter.py --agent Group27_NegotiationAssignment_Agent   also filter the sessions of an agent
+#   python filter/filter.py --summaries results/results_summaries.json --tournament results/tournament.json
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Analyse tournament results")
+    parser.add_argument("--agent", help="agent (class name) to report on and filter")
+    parser.add_argument("--store", default="results/results_store", help="columnar result store")
+    parser.add_argument("--summaries", help="summaries file, used instead of the store")
+    parser.add_argument("--tournament", default="results/tournament.json", help="tournament file of the summaries")
+    parser.add_argument("--output", default="results/results_filtered.json", help="filtered sessions of the agent")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temporary:
+        if args.summaries:
+            store = build_store(temporary, stored_sessions(args.tournament, args.summaries))
+        else:
+            store = ResultStore(args.store)
+
+        print(f"{len(store)} sessions\n")
+        print(f"{'agent':<40} {'sessions':>8} {'mean':>6} {'median':>6} {'std':>6} {'agree':>6} {'nash':>6} {'welfare':>7}")
+        for name, s in sorted(agent_statistics(store).items(), key=lambda x: -x[1]["mean_utility"]):
+            print(
+                f"{name:<40} {s['sessions']:>8} {s['mean_utility']:>6.3f} {s['median_utility']:>6.3f} "
+                f"{s['std_utility']:>6.3f} {s['agreement_rate']:>6.3f} {s['mean_nash_product']:>6.3f} "
+                f"{s['mean_social_welfare']:>7.3f}"
+            )
+
+        names, matrices = head_to_head(store)
+        print("\nhead-to-head mean utility (row agent against column agent):")
+        print(" " * 40 + "".join(f"{i:>7}" for i in range(len(names))))
+        for row, name in enumerate(names):
+            cells = [
+                f"{matrices['mean_utility'][row, column]:>7.3f}" if matrices["sessions"][row, column] else f"{'-':>7}"
+                for column in range(len(names))
+            ]
+            print(f"{row:>2} {name:<37}" + "".join(cells))
+
+        if args.agent:
+            report = agent_report(store, args.agent)
+            print(f"\n{args.agent}: {report['sessions']} sessions, {report['no_agreement']} without agreement")
+            for group in ("opponents", "domains"):
+                print(f"  per {group[:-1]}:")
+                for name, s in report[group].items():
+                    print(f"    {name:<40} {s['sessions']:>6} sessions, mean utility {s['mean_utility']:.3f}, "
+                          f"agreement rate {s['agreement_rate']:.3f}")
+
+            with ResultsWriter(args.output) as writer:
+                writer.write_all(store.records(store.mask(agent=args.agent)))
+            print(f"\nsessions of {args.agent} written to {args.output}")
+
+        # the memory mapped columns must be closed before the temporary store is removed
+        del store
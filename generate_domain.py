@@ -0,0 +1,30 @@
+import argparse
+import os
+from math import prod
+
+from utils.domain_generator import WEIGHT_DISTRIBUTIONS, generate_domain, write_domain
+
+# Generate a synthetic domain to test agents and runners at scale:
+#   The domain, profileA, profileB and specials (Pareto front, Nash and Kalai bid) are written in the format of
+#   the domains directory, so the profiles can be used in run.py, run_tournament.py and run_benchmark.py.
+#
+#   python generate_domain.py large --values 10 10 10 10 10 10               6 issues of 10 values, 1M bids
+#   python generate_domain.py huge --issues 8 --num-values 8 --weights skewed --seed 3
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic domain")
+    parser.add_argument("name", help="name of the domain")
+    parser.add_argument("--values", nargs="+", type=int, help="number of values of every issue")
+    parser.add_argument("--issues", type=int, default=5, help="number of issues (without --values)")
+    parser.add_argument("--num-values", type=int, default=10, help="values per issue (without --values)")
+    parser.add_argument("--weights", default="random", choices=WEIGHT_DISTRIBUTIONS, help="weight distribution")
+    parser.add_argument("--seed", type=int, help="seed of the random generator")
+    parser.add_argument("--directory", help="output directory, default domains/<name>")
+    parser.add_argument("--no-specials", action="store_true", help="do not compute specials.json")
+    args = parser.parse_args()
+
+    values = args.values or [args.num_values] * args.issues
+    directory = args.directory or os.path.join("domains", args.name)
+
+    generated = generate_domain(args.name, values, args.weights, args.seed)
+    write_domain(generated, directory, specials=not args.no_specials)
+    print(f"wrote {args.name} with {prod(values)} bids to {directory}")
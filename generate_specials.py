@@ -0,0 +1,42 @@
+import argparse
+import glob
+import json
+import os
+from time import perf_counter
+
+from agents.common.profile_cache import get_profile
+from utils.pareto import compute_specials, write_specials
+
+# (Re)compute the specials.json (Pareto front, Nash and Kalai bid) of domain directories:
+#
+#   python generate_specials.py domains/domain00 domains/jobs     write specials.json of these domains
+#   python generate_specials.py --check domains/domain*           verify the stored specials.json files
+#
+# With --check nothing is written, and the exit code is 1 when a stored file differs from the computed one.
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compute specials.json of domains")
+    parser.add_argument("directories", nargs="+", help="domain directories")
+    parser.add_argument("--check", action="store_true", help="compare with the stored specials.json")
+    args = parser.parse_args()
+
+    mismatches = 0
+    for directory in args.directories:
+        profiles = [
+            glob.glob(os.path.join(directory, f"*profile{side}.json"))[0] for side in "AB"
+        ]
+        start = perf_counter()
+        specials = compute_specials(*[get_profile(f"file:{p}") for p in profiles])
+        duration = perf_counter() - start
+
+        path = os.path.join(directory, "specials.json")
+        if args.check:
+            with open(path) as f:
+                identical = f.read() == json.dumps(specials, indent=2)
+            mismatches += not identical
+            print(f"{directory}: {'identical' if identical else 'DIFFERENT'} ({duration:.2f}s)")
+        else:
+            write_specials(specials, path)
+            print(f"{directory}: {len(specials['pareto_front'])} bids on the Pareto front ({duration:.2f}s)")
+
+    if mismatches:
+        exit(1)
@@ -1,7 +1,7 @@
-import json
 import os
 
 from utils.plot_trace import plot_trace
+from utils.result_writer import write_json
 from utils.runners import run_session
 
 # create results directory if it does not exist
@@ -12,6 +12,10 @@ if not os.path.exists("results"):
 #   We need to specify the classpath of 2 agents to start a negotiation.
 #   We need to specify the preference profiles for both agents. The first profile will be assigned to the first agent.
 #   We need to specify a deadline of amount of rounds we can negotiate before we end without agreement
+#   Optionally, we can specify a dictionary of parameters for each agent (e.g. {"fastspace": True} for the
+#   time dependent agents)
+#   Optionally, we can set "timing" to True to add a timing report (in seconds) to the results summary, and
+#   "profile_dir" to dump a cProfile file of the session to that directory (inspect it with pstats or snakeviz)
 settings = {
     "agents": [
         "agents.template_agent.agent_gosho_ascended.AgentGosho",
@@ -29,8 +33,6 @@ results_trace, results_summary = run_session(settings)
 # plot trace to html file
 plot_trace(results_trace, "results/trace_plot.html")
 
-# write results to file
-with open("results/results_trace.json", "w") as f:
-    f.write(json.dumps(results_trace, indent=2))
-with open("results/results_summary.json", "w") as f:
-    f.write(json.dumps(results_summary, indent=2))
+# write results to file (streamed, add .gz to a file name to compress it)
+write_json(results_trace, "results/results_trace.json")
+write_json(results_summary, "results/results_summary.json")
@@ -0,0 +1,60 @@
+import argparse
+import json
+import os
+
+from utils.benchmark import AGENTS, DOMAINS, OPPONENT, compare, print_report, run_benchmark
+
+# Benchmark the throughput of the agents on the shipped domains:
+#   Every agent negotiates a number of fixed seed sessions against the opponent on every domain. The report
+#   contains sessions/second, turn latency percentiles, setup cost (Settings and first turn) and peak RSS per
+#   agent and domain, and is written as JSON so it can be stored as a baseline.
+#
+#   python run_benchmark.py                                           run all agents on all domains
+#   python run_benchmark.py --domains domain00 jobs --sessions 5      run a subset
+#   python run_benchmark.py --baseline results/benchmark_base.json    run and flag regressions against a baseline
+#   python run_benchmark.py --baseline base.json --current new.json   only compare two stored reports
+#
+# With a baseline, the exit code is 1 when a regression is found.
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark agents on the domains")
+    parser.add_argument("--agents", nargs="+", default=AGENTS, help="agent classpaths")
+    parser.add_argument("--domains", nargs="+", default=list(DOMAINS), help="domain names")
+    parser.add_argument("--opponent", default=OPPONENT, help="opponent classpath")
+    parser.add_argument("--sessions", type=int, default=3, help="sessions per agent and domain")
+    parser.add_argument("--rounds", type=int, default=200, help="deadline in rounds")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first session")
+    parser.add_argument("--output", default="results/benchmark.json", help="report file")
+    parser.add_argument("--baseline", help="report to compare against")
+    parser.add_argument("--current", help="stored report to compare, instead of running")
+    parser.add_argument("--threshold", type=float, default=0.2, help="relative change that is a regression")
+    args = parser.parse_args()
+
+    if args.current:
+        with open(args.current) as f:
+            report = json.load(f)
+    else:
+        report = run_benchmark(
+            agents=args.agents,
+            domains={name: DOMAINS[name] for name in args.domains},
+            sessions=args.sessions,
+            deadline_rounds=args.rounds,
+            opponent=args.opponent,
+            seed=args.seed,
+        )
+        directory = os.path.dirname(args.output)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        with open(args.output, "w") as f:
+            f.write(json.dumps(report, indent=2))
+
+    print_report(report)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report, args.threshold)
+        print(f"\n{len(regressions)} regression(s) against {args.baseline}")
+        for regression in regressions:
+            print(f"  {regression}")
+        if regressions:
+            exit(1)
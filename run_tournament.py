@@ -1,7 +1,9 @@
-import json
 import os
+from contextlib import nullcontext
 
-from utils.runners import run_tournament
+from utils.result_store import ResultStoreWriter
+from utils.result_writer import ResultsWriter
+from utils.runners import iter_tournament
 
 # create results directory if it does not exist
 if not os.path.exists("results"):
@@ -11,6 +13,15 @@ if not os.path.exists("results"):
 #   We need to specify the classpath all agents that will participate in the tournament
 #   We need to specify duos of preference profiles that will be played by the agents
 #   We need to specify a deadline of amount of rounds we can negotiate before we end without agreement
+#   Optionally, we can specify parameters per agent classpath that are passed to the agent in every session
+#   Optionally, we can specify the number of worker processes that run sessions in parallel (None uses all cores)
+#   Optionally, we can specify a journal file that stores every finished session. With resume set to True, the
+#   sessions that are already in the journal are skipped (e.g. after a crash or Ctrl-C)
+#   Optionally, we can set "timing" and "profile_dir" to instrument every session (see run.py)
+#   Optionally, we can set a budget with a maximum number of sessions and/or minutes. The sessions are planned up
+#   front with an estimate of their wall time from the benchmark history (run_benchmark.py), and only the sessions
+#   that fit in the budget are run, so unattended runs stop predictably. Without a budget, more than 100 sessions
+#   are only confirmed when running in a terminal.
 tournament_settings = {
     "agents": [
         "agents.boulware_agent.boulware_agent.BoulwareAgent",
@@ -28,14 +39,43 @@ tournament_settings = {
         ["domains/domain01/profileA.json", "domains/domain01/profileB.json"],
     ],
     "deadline_rounds": 200,
+    "workers": 1,
+    "journal": "results/results_journal.jsonl",
+    "resume": False,
+    "budget": None,  # e.g. {"max_sessions": 500, "max_minutes": 30}
+    "history": "results/benchmark.json",
 }
 
-# run a session and obtain results in dictionaries
-tournament, results_summaries = run_tournament(tournament_settings)
+# Output files, the format follows the extension: .json writes a JSON array, .jsonl one JSON object per line. Add
+# .gz to compress (e.g. results/results_summaries.jsonl.gz). Results are written as soon as a session finishes,
+# so memory stays flat no matter how large the tournament is. Set traces to a file to also store the full trace
+# of every session. The store is a directory with the results in columnar form (one .npy file per column), to
+# query large tournaments with utils.result_store.ResultStore, set it to None to skip it.
+output_files = {
+    "tournament": "results/tournament.json",
+    "summaries": "results/results_summaries.json",
+    "traces": None,
+    "store": "results/results_store",
+}
 
-# save the tournament settings for reference
-with open("results/tournament.json", "w") as f:
-    f.write(json.dumps(tournament, indent=2))
-# save the result summaries
-with open("results/results_summaries.json", "w") as f:
-    f.write(json.dumps(results_summaries, indent=2))
+# worker processes import this script, so only run the tournament from the main process
+if __name__ == "__main__":
+    traces_file, store_directory = output_files["traces"], output_files["store"]
+    with ResultsWriter(output_files["tournament"]) as tournament_writer, ResultsWriter(
+        output_files["summaries"]
+    ) as summaries_writer, (
+        ResultsWriter(traces_file) if traces_file else nullcontext()
+    ) as traces_writer, (
+        ResultStoreWriter(store_directory) if store_directory else nullcontext()
+    ) as store_writer:
+        # run the sessions and save their settings and result summaries (and traces) as they come in, so
+        # the n-th settings always belong to the n-th summary, also when a budget skips sessions
+        for settings, results_trace, results_summary in iter_tournament(
+            tournament_settings, traces=traces_file is not None
+        ):
+            tournament_writer.write(settings)
+            summaries_writer.write(results_summary)
+            if store_writer:
+                store_writer.append(settings, results_summary)
+            if traces_writer and results_trace is not None:
+                traces_writer.write(results_trace)
@@ -0,0 +1,50 @@
+import itertools
+import os
+from typing import List
+
+import pytest
+from geniusweb.issuevalue.Bid import Bid
+from geniusweb.profile.utilityspace.LinearAdditive import LinearAdditive
+
+from agents.common.profile_cache import get_profile
+
+DOMAINS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "domains")
+
+
+def load_profile(domain: str, name: str) -> LinearAdditive:
+    return get_profile(f"file:{os.path.join(DOMAINS, domain, name)}")
+
+
+def enumerate_bids(profile: LinearAdditive) -> List[Bid]:
+    """all bids of the domain of a profile, by brute force"""
+    domain = profile.getDomain()
+    issues = sorted(domain.getIssues())
+    return [
+        Bid(dict(zip(issues, values)))
+        for values in itertools.product(*(list(domain.getValues(i)) for i in issues))
+    ]
+
+
+@pytest.fixture(scope="session")
+def profile_a() -> LinearAdditive:
+    return load_profile("domain00", "profileA.json")
+
+
+@pytest.fixture(scope="session")
+def profile_b() -> LinearAdditive:
+    return load_profile("domain00", "profileB.json")
+
+
+@pytest.fixture(scope="session")
+def jobs_profile() -> LinearAdditive:
+    return load_profile("jobs", "jobsprofileA.json")
+
+
+@pytest.fixture(scope="session")
+def domain00_bids(profile_a) -> List[Bid]:
+    return enumerate_bids(profile_a)
+
+
+@pytest.fixture(scope="session")
+def jobs_bids(jobs_profile) -> List[Bid]:
+    return enumerate_bids(jobs_profile)
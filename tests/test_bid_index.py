@@ -0,0 +1,38 @@
+import pytest
+
+from Group27_NegotiationAssignment_Project.Group27_NegotiationAssignment_Agent.bid_index import (
+    SortedBidIndex,
+)
+
+
+@pytest.fixture(scope="module")
+def index(profile_a):
+    return SortedBidIndex(profile_a)
+
+
+@pytest.fixture(scope="module")
+def utilities(profile_a, domain00_bids):
+    return sorted((float(profile_a.getUtility(bid)) for bid in domain00_bids), reverse=True)
+
+
+def test_all_bids_sorted_on_utility(index, profile_a, domain00_bids, utilities):
+    assert index.size() == len(domain00_bids)
+    assert [index.utility(p) for p in range(index.size())] == pytest.approx(utilities)
+    assert len({index.get(p) for p in range(index.size())}) == len(domain00_bids)
+    for position in range(0, index.size(), 97):
+        assert float(profile_a.getUtility(index.get(position))) == pytest.approx(
+            index.utility(position)
+        )
+
+
+def test_best_and_kth_best(index, profile_a, utilities):
+    assert float(profile_a.getUtility(index.best())) == pytest.approx(utilities[0])
+    for k in (1, 2, 10, 1000, len(utilities)):
+        assert float(profile_a.getUtility(index.kth_best(k))) == pytest.approx(utilities[k - 1])
+
+
+@pytest.mark.parametrize("threshold", [0.0, 0.5, 0.8, 0.95, 1.1])
+def test_count_at_least(index, utilities, threshold):
+    expected = sum(1 for utility in utilities if utility >= threshold)
+    assert index.count_at_least(threshold) == expected
+    assert index.at_least(threshold) == range(expected)
@@ -0,0 +1,56 @@
+import os
+
+import numpy as np
+import pytest
+
+from Group27_NegotiationAssignment_Project.Group27_NegotiationAssignment_Agent import (
+    bid_index,
+)
+from Group27_NegotiationAssignment_Project.Group27_NegotiationAssignment_Agent.bid_index import (
+    SortedBidIndex,
+    open_index,
+)
+
+
+def test_on_disk_index_matches_in_memory(profile_a, tmp_path):
+    in_memory = SortedBidIndex(profile_a)
+    on_disk = SortedBidIndex(profile_a, str(tmp_path))
+
+    (key,) = os.listdir(tmp_path)
+    assert sorted(os.listdir(tmp_path / key)) == ["rows.npy", "utilities.npy"]
+    assert isinstance(on_disk._rows, np.memmap)
+    assert isinstance(on_disk._utilities, np.memmap)
+
+    assert on_disk.size() == in_memory.size()
+    for position in range(0, in_memory.size(), 101):
+        assert on_disk.get(position) == in_memory.get(position)
+        assert on_disk.utility(position) == pytest.approx(in_memory.utility(position), abs=1e-6)
+    assert on_disk.count_at_least(0.8) == pytest.approx(in_memory.count_at_least(0.8), abs=2)
+
+
+def test_index_is_reopened_without_building(profile_a, tmp_path, monkeypatch):
+    first = SortedBidIndex(profile_a, str(tmp_path))
+
+    def build(self):
+        raise AssertionError("the index should be opened, not built")
+
+    monkeypatch.setattr(SortedBidIndex, "_build", build)
+    second = SortedBidIndex(profile_a, str(tmp_path))
+    assert second.best() == first.best()
+
+
+def test_profiles_get_their_own_index(profile_a, profile_b, tmp_path):
+    SortedBidIndex(profile_a, str(tmp_path))
+    SortedBidIndex(profile_b, str(tmp_path))
+    assert len(os.listdir(tmp_path)) == 2
+
+
+def test_large_domains_are_indexed_on_disk(jobs_profile, tmp_path, monkeypatch):
+    monkeypatch.setattr(bid_index, "INDEX_DIRECTORY", str(tmp_path))
+
+    assert not isinstance(open_index(jobs_profile)._rows, np.memmap)
+    assert not os.listdir(tmp_path)
+
+    monkeypatch.setattr(bid_index, "ON_DISK_THRESHOLD", 100)
+    assert isinstance(open_index(jobs_profile)._rows, np.memmap)
+    assert len(os.listdir(tmp_path)) == 1
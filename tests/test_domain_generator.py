@@ -0,0 +1,81 @@
+import json
+import os
+from math import prod
+
+import pytest
+
+from agents.common.profile_cache import get_profile
+from conftest import enumerate_bids
+from utils import pareto
+from utils.domain_generator import WEIGHT_DISTRIBUTIONS, generate_domain, letters, write_domain
+
+
+def test_letters():
+    assert [letters(i) for i in (0, 1, 25, 26, 27, 51, 52, 701, 702)] == [
+        "A", "B", "Z", "AA", "AB", "AZ", "BA", "ZZ", "AAA"
+    ]
+
+
+@pytest.mark.parametrize("weights", WEIGHT_DISTRIBUTIONS)
+@pytest.mark.parametrize("seed", range(20))
+def test_profiles(weights, seed):
+    values = [1, 2, 3, 5, 7, 2, 4, 3]
+    generated = generate_domain("generated", values, weights, seed)
+
+    issues_values = generated["domain"]["issuesValues"]
+    assert [len(issue["values"]) for issue in issues_values.values()] == values
+    for profile_name in ("profileA", "profileB"):
+        space = generated[profile_name]["LinearAdditiveUtilitySpace"]
+        assert space["domain"] == generated["domain"]
+        issue_weights = list(space["issueWeights"].values())
+        assert all(w >= 0 for w in issue_weights)
+        assert sum(issue_weights) == pytest.approx(1, abs=1e-9)
+        if weights == "uniform":
+            assert max(issue_weights) - min(issue_weights) < 1e-4
+        for issue, utilities in space["issueUtilities"].items():
+            utilities = utilities["DiscreteValueSetUtilities"]["valueUtilities"]
+            assert list(utilities) == issues_values[issue]["values"]
+            assert all(0 <= u <= 1 for u in utilities.values())
+            assert max(utilities.values()) == 1
+
+
+def test_seed_and_given_weights():
+    assert generate_domain("x", [3, 4], seed=1) == generate_domain("x", [3, 4], seed=1)
+    assert generate_domain("x", [3, 4], seed=1) != generate_domain("x", [3, 4], seed=2)
+    generated = generate_domain("x", [3, 4], [0.25, 0.75], seed=1)
+    for profile_name in ("profileA", "profileB"):
+        weights = generated[profile_name]["LinearAdditiveUtilitySpace"]["issueWeights"]
+        assert weights == {"issueA": 0.25, "issueB": 0.75}
+
+
+@pytest.mark.parametrize(
+    "values, weights", [([3, 4], "normal"), ([3, 4], [1.0]), ([3, 0], "uniform")]
+)
+def test_invalid(values, weights):
+    with pytest.raises(ValueError):
+        generate_domain("x", values, weights)
+
+
+def test_written_domain(tmp_path):
+    generated = generate_domain("generated", [3, 4, 2, 5], "skewed", seed=3)
+    directory = str(tmp_path / "generated")
+    write_domain(generated, directory)
+
+    assert sorted(os.listdir(directory)) == [
+        "generated.json", "profileA.json", "profileB.json", "specials.json"
+    ]
+    profiles = [get_profile(f"file:{os.path.join(directory, f'profile{side}.json')}") for side in "AB"]
+    assert len(enumerate_bids(profiles[0])) == prod([3, 4, 2, 5])
+
+    # the specials of the json profiles are those of the loaded profiles
+    with open(os.path.join(directory, "specials.json")) as f:
+        specials = json.load(f)
+    computed = pareto.compute_specials(*profiles)
+    assert specials["nash"]["bid"] == computed["nash"]["bid"]
+    assert specials["kalai"]["bid"] == computed["kalai"]["bid"]
+    assert [p["bid"] for p in specials["pareto_front"]] == [p["bid"] for p in computed["pareto_front"]]
+    for point, computed_point in zip(specials["pareto_front"], computed["pareto_front"]):
+        assert point["utility"] == pytest.approx(computed_point["utility"])
+
+    write_domain(generated, str(tmp_path / "without"), specials=False)
+    assert "specials.json" not in os.listdir(tmp_path / "without")
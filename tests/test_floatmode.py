@@ -0,0 +1,118 @@
+import glob
+import os
+import random
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from geniusweb.actions.Offer import Offer
+from geniusweb.actions.PartyId import PartyId
+from geniusweb.inform.Settings import Settings
+from geniusweb.inform.YourTurn import YourTurn
+from geniusweb.progress.ProgressRounds import ProgressRounds
+from geniusweb.references.Parameters import Parameters
+from geniusweb.references.ProfileRef import ProfileRef
+from geniusweb.references.ProtocolRef import ProtocolRef
+from uri.uri import URI
+
+from agents.time_dependent_agent.extended_util_space import ExtendedUtilSpace
+from agents.time_dependent_agent.fast_util_space import FastExtendedUtilSpace
+from agents.time_dependent_agent.time_dependent_agent import TimeDependentAgent
+from agents.time_dependent_agent.util_space_cache import util_space_cache
+from conftest import DOMAINS, enumerate_bids, load_profile
+
+# the float mode must make the same decisions as the Decimal mode, up to float rounding
+TOLERANCE = 1e-9
+# concession speeds of the time dependent agents (boulware, linear, default, conceder)
+E_VALUES = [0.2, 1.0, 1.2, 2.0]
+ROUNDS = 10
+# number of bids per profile to check _isGood on
+SAMPLE = 300
+
+PROFILES = sorted(
+    os.path.relpath(path, DOMAINS)
+    for path in glob.glob(os.path.join(DOMAINS, "*", "*profile[AB].json"))
+)
+
+
+class _Connection:
+    """Connection of the agent to the test, keeps the actions it sends"""
+
+    def __init__(self):
+        self.actions = []
+
+    def send(self, action):
+        self.actions.append(action)
+
+    def addListener(self, listener):
+        pass
+
+    def removeListener(self, listener):
+        pass
+
+    def close(self):
+        pass
+
+
+def _settings(profile: str, e: float, floatmode: bool, current_round: int) -> Settings:
+    return Settings(
+        PartyId("party1"),
+        ProfileRef(URI(f"file:{os.path.join(DOMAINS, profile)}")),
+        ProtocolRef(URI("SAOP")),
+        ProgressRounds(ROUNDS, current_round, datetime.fromtimestamp(2 ** 31)),
+        Parameters({"e": e, "floatmode": floatmode}),
+    )
+
+
+def _agent(profile: str, e: float, floatmode: bool) -> TimeDependentAgent:
+    """a time dependent agent that has made its first offer"""
+    agent = TimeDependentAgent()
+    agent.connect(_Connection())
+    agent.notifyChange(_settings(profile, e, floatmode, 0))
+    agent.notifyChange(YourTurn())
+    (action,) = agent.getConnection().actions
+    assert isinstance(action, Offer)
+    return agent
+
+
+def _near(utility: Decimal, *bounds: Decimal) -> bool:
+    return any(abs(utility - bound) <= Decimal(TOLERANCE) for bound in bounds)
+
+
+@pytest.mark.parametrize("e", E_VALUES)
+@pytest.mark.parametrize("profile", PROFILES)
+def test_float_mode_makes_the_same_decisions(profile, e):
+    utilspace = load_profile(*os.path.split(profile))
+    decimal_agent = _agent(profile, e, False)
+    float_agent = _agent(profile, e, True)
+    # the agents use the spaces of the process-wide cache
+    decimal_space = util_space_cache.get(ExtendedUtilSpace, utilspace)
+    float_space = util_space_cache.get(FastExtendedUtilSpace, utilspace)
+
+    bids = enumerate_bids(utilspace)
+    bids = random.Random(0).sample(bids, min(SAMPLE, len(bids)))
+
+    for current_round in range(ROUNDS + 1):
+        t = current_round / ROUNDS
+        decimal_agent.notifyChange(_settings(profile, e, False, current_round))
+        float_agent.notifyChange(_settings(profile, e, True, current_round))
+
+        goal = decimal_agent._getUtilityGoal(
+            t, e, decimal_space.getMin(), decimal_space.getMax()
+        )
+        goal_float = float_agent._getUtilityGoalFloat(
+            t, e, float_space.getMinFloat(), float_space.getMaxFloat()
+        )
+        assert goal_float == pytest.approx(float(goal), abs=TOLERANCE)
+
+        # bids near the bounds of [goal - tolerance, goal] may fall on either side
+        options = decimal_space.getBids(goal)
+        options_float = float_space.getBidsFloat(goal_float)
+        candidates = {options.get(i) for i in range(options.size())}
+        candidates_float = {options_float.get(i) for i in range(options_float.size())}
+        for bid in candidates ^ candidates_float:
+            assert _near(utilspace.getUtility(bid), goal - float_space.getTolerance(), goal), bid
+
+        for bid in bids:
+            if decimal_agent._isGood(bid) != float_agent._isGood(bid):
+                assert _near(utilspace.getUtility(bid), goal), bid
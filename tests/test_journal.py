@@ -0,0 +1,99 @@
+import os
+
+import pytest
+
+import utils.runners
+from conftest import DOMAINS
+from utils.journal import ResultsJournal, session_key
+from utils.runners import iter_tournament, tournament_sessions
+
+AGENTS = ["agents.A", "agents.B", "agents.C"]
+PROFILES = [os.path.join(DOMAINS, "jobs", f"jobsprofile{side}.json") for side in "AB"]
+
+
+def _tournament_settings(journal: str, resume: bool) -> dict:
+    return {
+        "agents": AGENTS,
+        "profile_sets": [PROFILES],
+        "deadline_rounds": 10,
+        "journal": journal,
+        "resume": resume,
+        "history": None,
+    }
+
+
+def _summary(settings: dict) -> dict:
+    return {"agent_1": settings["agents"][0], "agent_2": settings["agents"][1], "result": "agreement"}
+
+
+@pytest.fixture
+def sessions_run(monkeypatch):
+    """settings of the sessions that are actually run, the run itself is faked"""
+    run = []
+
+    def run_session(settings):
+        run.append(settings)
+        return {}, _summary(settings)
+
+    monkeypatch.setattr(utils.runners, "run_session", run_session)
+    return run
+
+
+def test_session_key():
+    settings = tournament_sessions(_tournament_settings("", False))[0]
+    assert session_key(settings) == session_key(dict(reversed(list(settings.items()))))
+    assert session_key(settings) != session_key({**settings, "deadline_rounds": 11})
+    assert session_key(settings) != session_key({**settings, "parameters": [{"e": 1}, {}]})
+
+
+def test_journal_round_trip(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    sessions = tournament_sessions(_tournament_settings(path, False))
+    with ResultsJournal(path) as journal:
+        for settings in sessions[:2]:
+            journal.append(settings, _summary(settings))
+
+    # a crash during a write leaves a partial line
+    with open(path, "a") as f:
+        f.write('{"settings": {"agents"')
+
+    journal = ResultsJournal(path, resume=True)
+    assert journal.load() == {session_key(s): _summary(s) for s in sessions[:2]}
+    with journal:
+        journal.append(sessions[2], _summary(sessions[2]))
+    assert len(journal.load()) == 3
+
+    # without resume a new journal is started
+    assert ResultsJournal(path).load() == {}
+    with ResultsJournal(path):
+        pass
+    assert ResultsJournal(path, resume=True).load() == {}
+
+
+def test_resume_skips_journaled_sessions(tmp_path, sessions_run):
+    path = str(tmp_path / "journal.jsonl")
+    sessions = tournament_sessions(_tournament_settings(path, False))
+    with ResultsJournal(path) as journal:
+        for settings in sessions[1::2]:
+            journal.append(settings, _summary(settings))
+
+    results = list(iter_tournament(_tournament_settings(path, True), traces=True))
+
+    assert sessions_run == sessions[::2]
+    # all sessions are yielded in tournament order, journaled ones without a trace
+    assert [settings for settings, _, _ in results] == sessions
+    assert [summary for _, _, summary in results] == [_summary(s) for s in sessions]
+    assert [trace is None for _, trace, _ in results] == [False, True] * 3
+    # the journal now holds every session, so resuming again runs nothing
+    sessions_run.clear()
+    assert len(list(iter_tournament(_tournament_settings(path, True)))) == len(sessions)
+    assert sessions_run == []
+
+
+def test_without_resume_all_sessions_run(tmp_path, sessions_run):
+    path = str(tmp_path / "journal.jsonl")
+    list(iter_tournament(_tournament_settings(path, False)))
+    list(iter_tournament(_tournament_settings(path, False)))
+    sessions = tournament_sessions(_tournament_settings(path, False))
+    assert sessions_run == sessions + sessions
+    assert len(ResultsJournal(path, resume=True).load()) == len(sessions)
@@ -0,0 +1,101 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from conftest import DOMAINS, enumerate_bids, load_profile
+from utils.pareto import Specials, compute_specials, get_specials, pareto_front
+
+
+def _dominated(util_a: np.ndarray, util_b: np.ndarray) -> np.ndarray:
+    """by brute force, whether every bid is weakly dominated by a different outcome"""
+    better_or_equal = (util_a[None, :] >= util_a[:, None]) & (util_b[None, :] >= util_b[:, None])
+    better = (util_a[None, :] > util_a[:, None]) | (util_b[None, :] > util_b[:, None])
+    return (better_or_equal & better).any(axis=1)
+
+
+@pytest.fixture(scope="module")
+def jobs():
+    return load_profile("jobs", "jobsprofileA.json"), load_profile("jobs", "jobsprofileB.json")
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_front_of_random_points(seed):
+    rng = np.random.default_rng(seed)
+    # few distinct values, so there are ties on either utility and identical points
+    util_a, util_b = rng.integers(0, 20, (2, 500)).astype(float)
+    front = pareto_front(util_a, util_b)
+
+    assert list(util_a[front]) == sorted(util_a[front])
+    points = {(a, b) for a, b in zip(util_a, util_b)}
+    expected = {p for p, dominated in zip(zip(util_a, util_b), _dominated(util_a, util_b)) if not dominated}
+    assert {(util_a[i], util_b[i]) for i in front} == expected
+    # of identical points only the first is kept
+    assert len(front) == len(expected) <= len(points)
+    for i in front:
+        assert i == np.flatnonzero((util_a == util_a[i]) & (util_b == util_b[i]))[0]
+
+
+@pytest.mark.parametrize("chunk_size", [1 << 20, 7, 100])
+def test_specials_against_brute_force(jobs, chunk_size):
+    profile_a, profile_b = jobs
+    bids = enumerate_bids(profile_a)
+    util_a = np.array([float(profile_a.getUtility(bid)) for bid in bids])
+    util_b = np.array([float(profile_b.getUtility(bid)) for bid in bids])
+
+    specials = compute_specials(profile_a, profile_b, chunk_size)
+
+    front = np.array([point["utility"] for point in specials["pareto_front"]])
+    expected = sorted({(a, b) for a, b, d in zip(util_a, util_b, _dominated(util_a, util_b)) if not d})
+    assert front == pytest.approx(np.array(expected))
+    assert specials["nash"]["utility"][0] * specials["nash"]["utility"][1] == pytest.approx(
+        np.max(util_a * util_b)
+    )
+    kalai = specials["kalai"]["utility"]
+    assert abs(kalai[0] - kalai[1]) == pytest.approx(np.min(np.abs(front[:, 0] - front[:, 1])))
+
+    # the bids of the specials have the utilities of the specials
+    for point in [specials["nash"], specials["kalai"], *specials["pareto_front"]]:
+        bid = next(b for b in bids if {i: v.getValue() for i, v in b.getIssueValues().items()} == point["bid"])
+        assert point["utility"] == pytest.approx([float(profile_a.getUtility(bid)), float(profile_b.getUtility(bid))])
+
+
+def test_specials_as_shipped(profile_a, profile_b):
+    with open(os.path.join(DOMAINS, "domain00", "specials.json")) as f:
+        shipped = json.load(f)
+    computed = compute_specials(profile_a, profile_b)
+    assert len(computed["pareto_front"]) == len(shipped["pareto_front"])
+    points = zip(
+        [computed["nash"], computed["kalai"], *computed["pareto_front"]],
+        [shipped["nash"], shipped["kalai"], *shipped["pareto_front"]],
+    )
+    for computed_point, shipped_point in points:
+        assert computed_point["bid"] == shipped_point["bid"]
+        assert computed_point["utility"] == pytest.approx(shipped_point["utility"])
+
+
+def test_specials_distances_and_orientation():
+    specials = Specials(
+        {
+            "nash": {"utility": [0.6, 0.7]},
+            "kalai": {"utility": [0.65, 0.65]},
+            "pareto_front": [{"utility": [0.2, 1.0]}, {"utility": [0.65, 0.65]}, {"utility": [1.0, 0.3]}],
+        }
+    )
+    assert specials.distances(0.65, 0.65) == pytest.approx(
+        {"pareto_distance": 0.0, "nash_distance": np.hypot(0.05, 0.05), "kalai_distance": 0.0}
+    )
+    assert specials.distances(1.0, 0.0)["pareto_distance"] == pytest.approx(0.3)
+    assert specials.swapped().distances(0.7, 0.6) == pytest.approx(specials.distances(0.6, 0.7))
+
+
+def test_get_specials():
+    paths = [os.path.join(DOMAINS, "domain00", f"profile{side}.json") for side in "AB"]
+    uris = [f"file:{path}" for path in paths]
+    specials = get_specials(uris)
+    assert specials is not None
+    assert get_specials(uris[::-1]).distances(0.7, 0.6) == pytest.approx(specials.distances(0.6, 0.7))
+    assert get_specials([uris[0], uris[0]]) is None
+    assert get_specials([uris[0], f"file:{os.path.join(DOMAINS, 'domain01', 'profileB.json')}"]) is None
+    assert get_specials(paths) is None
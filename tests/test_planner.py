@@ -0,0 +1,108 @@
+import json
+import os
+
+import pytest
+
+from conftest import DOMAINS
+from utils.planner import (
+    DEFAULT_SECONDS_PER_ROUND,
+    CostModel,
+    TournamentPlan,
+    domain_size,
+    plan_sessions,
+)
+
+ROUNDS = 100
+JOBS = [os.path.join(DOMAINS, "jobs", f"jobsprofile{side}.json") for side in "AB"]
+DOMAIN00 = [os.path.join(DOMAINS, "domain00", f"profile{side}.json") for side in "AB"]
+
+
+def _history(cells) -> dict:
+    """benchmark report with the seconds per round of (agent, bids) cells"""
+    return {
+        "meta": {"deadline_rounds": ROUNDS},
+        "results": [
+            {"agent": agent, "bids": bids, "sessions_per_second": 1 / (seconds * ROUNDS) if seconds else 0}
+            for agent, bids, seconds in cells
+        ],
+    }
+
+
+def _session(agents, profiles=JOBS, rounds=ROUNDS) -> dict:
+    return {"agents": agents, "profiles": profiles, "deadline_rounds": rounds}
+
+
+@pytest.fixture
+def model():
+    # A costs 1 ms per round plus 1 ms per 1000 bids, B always 2 ms, C is never run
+    return CostModel(
+        _history(
+            [("A", 1000, 0.002), ("A", 3000, 0.004), ("B", 1000, 0.002), ("B", 9000, 0.002), ("C", 1000, 0)]
+        )
+    )
+
+
+def test_domain_size():
+    assert domain_size(JOBS) == 540
+    assert domain_size(DOMAIN00) == 9000
+
+
+def test_seconds_per_round(model):
+    assert model.has_history()
+    assert model.seconds_per_round("A", 2000) == pytest.approx(0.003)
+    assert model.seconds_per_round("A", 10000) == pytest.approx(0.011)
+    # never below the cheapest observation
+    assert model.seconds_per_round("A", 0) == pytest.approx(0.002)
+    assert model.seconds_per_round("B", 50000) == pytest.approx(0.002)
+    # unknown agents cost the median of the known agents
+    assert model.seconds_per_round("C", 2000) == pytest.approx(0.0025)
+    assert model.seconds_per_round("D", 2000) == pytest.approx(0.0025)
+
+
+def test_session_seconds(model):
+    assert model.session_seconds(_session(["A", "B"], DOMAIN00)) == pytest.approx((0.01 + 0.002) / 2 * ROUNDS)
+    assert model.session_seconds(_session(["B", "B"], JOBS, 10)) == pytest.approx(0.002 * 10)
+
+
+def test_without_history(tmp_path):
+    model = CostModel.load(str(tmp_path / "missing.json"))
+    assert not model.has_history()
+    assert model.seconds_per_round("A", 1000) == DEFAULT_SECONDS_PER_ROUND
+
+    path = tmp_path / "benchmark.json"
+    path.write_text(json.dumps(_history([("A", 1000, 0.002)])))
+    assert CostModel.load(str(path)).seconds_per_round("A", 5000) == pytest.approx(0.002)
+
+
+@pytest.mark.parametrize(
+    "budget, workers, selected",
+    [
+        (None, 1, 5),
+        ({}, 1, 5),
+        ({"max_sessions": 3}, 1, 3),
+        ({"max_sessions": 0}, 1, 0),
+        ({"max_minutes": 1}, 1, 2),
+        ({"max_minutes": 0.9}, 2, 4),
+        ({"max_minutes": 1, "max_sessions": 3}, 2, 3),
+        ({"max_minutes": 0.1}, 1, 0),
+    ],
+)
+def test_plan_budget(budget, workers, selected):
+    estimates = [20.0, 30.0, 15.0, 35.0, 10.0]
+    plan = TournamentPlan([{}] * len(estimates), estimates, workers, budget)
+    assert plan.selected == list(range(selected))
+    assert plan.estimated_minutes() == pytest.approx(sum(estimates[:selected]) / workers / 60)
+    assert f"planned {selected} of 5 sessions" in plan.describe()
+
+
+def test_plan_sessions(tmp_path):
+    path = tmp_path / "benchmark.json"
+    path.write_text(json.dumps(_history([("A", 540, 0.01), ("B", 540, 0.03)])))
+    sessions = [_session(["A", "B"]), _session(["B", "A"]), _session(["A", "A"])]
+
+    plan = plan_sessions(sessions, {"history": str(path), "budget": {"max_minutes": 5 / 60}, "workers": 1})
+    assert plan.estimates == pytest.approx([2.0, 2.0, 1.0])
+    assert plan.selected == [0, 1, 2]
+    plan = plan_sessions(sessions, {"history": str(path), "budget": {"max_minutes": 3 / 60}})
+    assert plan.selected == [0]
+    assert "no benchmark history" in plan_sessions(sessions, {"history": None}).describe()
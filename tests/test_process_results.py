@@ -0,0 +1,73 @@
+import json
+import os
+import random
+
+import pytest
+
+from agents.common.compiled_profile import compile_profile
+from agents.common.profile_cache import get_profile
+from conftest import DOMAINS
+from utils.runners import process_results
+
+
+class _Action:
+    def __init__(self, bid):
+        self._bid = bid
+
+    def getBid(self):
+        return self._bid
+
+
+class _State:
+    """the part of SAOPState that process_results uses"""
+
+    def __init__(self, bids):
+        self._actions = [_Action(bid) for bid in bids]
+
+    def getActions(self):
+        return self._actions
+
+
+def _reordered_profile(tmp_path) -> str:
+    """profile B of domain00, with the values of every issue in reverse order"""
+    with open(os.path.join(DOMAINS, "domain00", "profileB.json")) as f:
+        content = json.load(f)
+    issues = content["LinearAdditiveUtilitySpace"]["domain"]["issuesValues"]
+    for issue in issues.values():
+        issue["values"].reverse()
+    path = tmp_path / "profileB.json"
+    path.write_text(json.dumps(content))
+    return f"file:{path}"
+
+
+def test_trace_utilities_with_differently_ordered_domains(tmp_path, domain00_bids):
+    uris = [f"file:{os.path.join(DOMAINS, 'domain00', 'profileA.json')}", _reordered_profile(tmp_path)]
+    profiles = [get_profile(uri) for uri in uris]
+    bids = random.Random(0).sample(domain00_bids, 20)
+
+    actions = [{"Offer": {"actor": f"party_{i % 2 + 1}"}} for i in range(len(bids) - 1)]
+    actions.append({"Accept": {"actor": "party_1"}})
+    results_dict = {
+        "SAOPState": {
+            "partyprofiles": {
+                f"party_{i + 1}": {"party": {"partyref": f"agents.Agent{i + 1}"}, "profile": uri}
+                for i, uri in enumerate(uris)
+            },
+            "actions": actions,
+            "connections": ["party_1", "party_2"],
+        }
+    }
+
+    trace, summary = process_results(_State(bids), results_dict)
+
+    for action, bid in zip(trace["actions"], bids):
+        utilities = next(iter(action.values()))["utilities"]
+        for i, profile in enumerate(profiles):
+            assert utilities[f"party_{i + 1}"] == pytest.approx(float(profile.getUtility(bid)))
+    assert summary["result"] == "agreement"
+    assert summary["utility_2"] == pytest.approx(float(profiles[1].getUtility(bids[-1])))
+
+
+def test_profiles_are_compiled_once(profile_a, profile_b):
+    assert compile_profile(profile_a) is compile_profile(profile_a)
+    assert compile_profile(profile_a) is not compile_profile(profile_b)
@@ -0,0 +1,191 @@
+import math
+import random
+from statistics import median, pstdev
+
+import numpy as np
+import pytest
+
+import utils.result_store
+from utils.analytics import agent_report, agent_statistics, head_to_head
+from utils.result_store import aggregate, build_store, stored_sessions
+from utils.result_writer import ResultsWriter
+
+AGENTS = ["agents.A", "agents.B", "agents.C"]
+DOMAINS = ["domain00", "domain01"]
+
+
+def _sessions(count: int, seed: int = 0):
+    """random (settings, results_summary) pairs, with the parties in either order"""
+    rng = random.Random(seed)
+    sessions = []
+    for _ in range(count):
+        agents = [rng.choice(AGENTS), rng.choice(AGENTS)]
+        domain = rng.choice(DOMAINS)
+        settings = {
+            "agents": agents,
+            "profiles": [f"domains/{domain}/profileA.json", f"domains/{domain}/profileB.json"],
+            "deadline_rounds": 10,
+        }
+        agreement = rng.random() < 0.7
+        utilities = [rng.random(), rng.random()] if agreement else [0, 0]
+        parties = [1, 2] if rng.random() < 0.5 else [2, 1]
+        summary = {"num_offers": rng.randint(1, 10), "result": "agreement" if agreement else "failed"}
+        for seat, party in enumerate(parties):
+            summary[f"agent_{party}"] = agents[seat]
+            summary[f"utility_{party}"] = utilities[seat]
+        summary["nash_product"] = utilities[0] * utilities[1]
+        summary["social_welfare"] = utilities[0] + utilities[1]
+        if agreement and domain == "domain00":
+            summary["pareto_distance"] = rng.random()
+        sessions.append((settings, summary))
+    return sessions
+
+
+def _seats(summary: dict):
+    """(agent, utility) of both seats, the lowest party number first"""
+    parties = sorted((k.split("_")[-1] for k in summary if k.startswith("agent_")), key=int)
+    return [(summary[f"agent_{p}"], summary[f"utility_{p}"]) for p in parties]
+
+
+def _domain(settings: dict) -> str:
+    return settings["profiles"][0].split("/")[1]
+
+
+@pytest.fixture(scope="module")
+def sessions():
+    return _sessions(500)
+
+
+@pytest.fixture(scope="module")
+def store(sessions, tmp_path_factory):
+    return build_store(str(tmp_path_factory.mktemp("store")), sessions)
+
+
+def test_records_by_seat(store, sessions):
+    assert len(store) == len(sessions)
+    for record, (settings, summary) in zip(store.records(), sessions):
+        seats = _seats(summary)
+        assert (record["agent_1"], record["agent_2"]) == (seats[0][0], seats[1][0])
+        assert record["utility_1"] == seats[0][1] and record["utility_2"] == seats[1][1]
+        assert record["domain"] == _domain(settings)
+        assert record["result"] == summary["result"]
+        assert record["num_offers"] == summary["num_offers"]
+        assert record["pareto_distance"] == summary.get("pareto_distance")
+
+
+def test_written_in_chunks(monkeypatch, store, sessions, tmp_path):
+    monkeypatch.setattr(utils.result_store, "CHUNK_SIZE", 7)
+    chunked = build_store(str(tmp_path), sessions)
+    assert len(chunked) == len(sessions)
+    for column in utils.result_store.COLUMNS:
+        assert np.array_equal(chunked.column(column), store.column(column), equal_nan=True)
+
+
+def test_empty_store(tmp_path):
+    store = build_store(str(tmp_path), [])
+    assert len(store) == 0
+    assert list(store.records()) == []
+    assert agent_statistics(store) == {}
+
+
+def test_stored_sessions(sessions, tmp_path):
+    files = [str(tmp_path / "tournament.json"), str(tmp_path / "summaries.jsonl")]
+    for path, records in zip(files, zip(*sessions)):
+        with ResultsWriter(path) as writer:
+            writer.write_all(records)
+    assert list(stored_sessions(*files)) == sessions
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {},
+        {"agent": "agents.A"},
+        {"agent": "agents.A", "opponent": "agents.B"},
+        {"opponent": "agents.C"},
+        {"domain": "domain01", "result": "failed"},
+        {"agent": "agents.unknown"},
+    ],
+)
+def test_mask(store, sessions, filters):
+    expected = []
+    for settings, summary in sessions:
+        agent, opponent = [agent for agent, _ in _seats(summary)]
+        match = any(
+            filters.get("agent", a) == a and filters.get("opponent", o) == o
+            for a, o in ((agent, opponent), (opponent, agent))
+        )
+        match &= filters.get("domain", _domain(settings)) == _domain(settings)
+        match &= filters.get("result", summary["result"]) == summary["result"]
+        expected.append(match)
+    assert store.mask(**filters).tolist() == expected
+
+
+def test_agent_utilities_and_aggregate(store, sessions):
+    for agent in AGENTS:
+        utilities = [u for _, s in sessions for a, u in _seats(s) if a == agent]
+        assert sorted(store.agent_utilities(agent)) == pytest.approx(sorted(utilities))
+        result = aggregate(store.agent_utilities(agent))
+        assert result["count"] == len(utilities)
+        assert result["mean"] == pytest.approx(sum(utilities) / len(utilities))
+        assert result["std"] == pytest.approx(pstdev(utilities))
+        assert (result["min"], result["max"]) == (min(utilities), max(utilities))
+
+    # missing values are ignored
+    distances = [s["pareto_distance"] for _, s in sessions if "pareto_distance" in s]
+    assert aggregate(store.column("pareto_distance"))["count"] == len(distances)
+    assert aggregate(np.array([np.nan])) == {"count": 0}
+
+
+def test_agent_statistics(store, sessions):
+    statistics = agent_statistics(store)
+    for agent in AGENTS:
+        played = [(u, s) for _, s in sessions for a, u in _seats(s) if a == agent]
+        utilities = [u for u, _ in played]
+        distances = [s["pareto_distance"] for _, s in played if "pareto_distance" in s]
+        expected = {
+            "sessions": len(played),
+            "mean_utility": sum(utilities) / len(utilities),
+            "median_utility": median(utilities),
+            "std_utility": pstdev(utilities),
+            "agreement_rate": sum(s["result"] == "agreement" for _, s in played) / len(played),
+            "mean_nash_product": sum(s["nash_product"] for _, s in played) / len(played),
+            "mean_social_welfare": sum(s["social_welfare"] for _, s in played) / len(played),
+            "mean_pareto_distance": sum(distances) / len(distances),
+        }
+        assert statistics[agent] == pytest.approx(expected)
+
+
+def test_head_to_head(store, sessions):
+    names, matrices = head_to_head(store)
+    for row, agent in enumerate(names):
+        for column, opponent in enumerate(names):
+            utilities = []
+            for _, summary in sessions:
+                seats = _seats(summary)
+                for seat in range(2):
+                    if seats[seat][0] == agent and seats[1 - seat][0] == opponent:
+                        utilities.append(seats[seat][1])
+            assert matrices["sessions"][row, column] == len(utilities)
+            if utilities:
+                assert matrices["mean_utility"][row, column] == pytest.approx(
+                    sum(utilities) / len(utilities)
+                )
+            else:
+                assert math.isnan(matrices["mean_utility"][row, column])
+
+
+def test_agent_report(store, sessions):
+    report = agent_report(store, "agents.B")
+    played = [s for _, s in sessions if "agents.B" in [a for a, _ in _seats(s)]]
+    assert report["sessions"] == len(played)
+    assert report["no_agreement"] == sum(s["result"] != "agreement" for s in played)
+    assert report["overall"] == agent_statistics(store)["agents.B"]
+    assert sum(o["sessions"] for o in report["opponents"].values()) == report["overall"]["sessions"]
+    assert sum(d["sessions"] for d in report["domains"].values()) == report["overall"]["sessions"]
+
+
+def test_unknown_agent_report(store):
+    report = agent_report(store, "agents.unknown")
+    assert report["sessions"] == 0 and report["overall"] == {}
+    assert report["opponents"] == {} and report["domains"] == {}
@@ -0,0 +1,45 @@
+import json
+
+import pytest
+
+from utils.result_writer import ResultsWriter, iter_results, write_json
+
+RECORDS = [
+    {"agents": ["agents.A", "agents.B"], "profiles": ["a.json", "b.json"]},
+    {"result": "agreement", "utility_1": 0.5, "nested": {"list": [1, 2, {"x": None}]}},
+    {},
+]
+
+
+@pytest.mark.parametrize("name", ["results.json", "results.jsonl", "results.json.gz", "results.jsonl.gz"])
+@pytest.mark.parametrize("records", [RECORDS, []])
+def test_round_trip(tmp_path, name, records):
+    path = str(tmp_path / "sub" / name)
+    with ResultsWriter(path) as writer:
+        writer.write_all(records)
+    assert list(iter_results(path)) == records
+
+
+@pytest.mark.parametrize("records", [RECORDS, []])
+def test_json_array_as_json_dumps(tmp_path, records):
+    path = str(tmp_path / "results.json")
+    with ResultsWriter(path) as writer:
+        for record in records:
+            writer.write(record)
+    with open(path) as f:
+        assert f.read() == json.dumps(records, indent=2)
+
+
+def test_jsonl_one_record_per_line(tmp_path):
+    path = str(tmp_path / "results.jsonl")
+    with ResultsWriter(path) as writer:
+        writer.write_all(RECORDS)
+    with open(path) as f:
+        assert [json.loads(line) for line in f] == RECORDS
+
+
+def test_write_json(tmp_path):
+    path = str(tmp_path / "trace.json")
+    write_json(RECORDS[1], path)
+    with open(path) as f:
+        assert f.read() == json.dumps(RECORDS[1], indent=2)
@@ -0,0 +1,122 @@
+import importlib
+import random
+from collections import Counter
+
+import pytest
+from geniusweb.issuevalue.Bid import Bid
+
+# the helpers of the template agents, Group27 keeps its own copy of them
+PACKAGES = [
+    "agents.template_agent",
+    "Group27_NegotiationAssignment_Project.Group27_NegotiationAssignment_Agent",
+]
+
+
+@pytest.fixture(params=PACKAGES)
+def package(request):
+    return request.param
+
+
+def _module(package: str, name: str):
+    return importlib.import_module(f"{package}.{name}")
+
+
+def test_bid_codec_round_trip(package, profile_a, domain00_bids):
+    compact_bid = _module(package, "compact_bid")
+    codec = compact_bid.BidCodec(profile_a.getDomain())
+
+    encoded = [codec.encode(bid) for bid in domain00_bids]
+    assert all(isinstance(bid, compact_bid.CompactBid) for bid in encoded)
+    assert len(set(encoded)) == len(domain00_bids)
+    for bid, compact in zip(domain00_bids, encoded):
+        assert codec.decode(compact) == bid
+        for issue in profile_a.getDomain().getIssues():
+            assert codec.value(compact, issue) == bid.getValue(issue)
+    assert codec.value(encoded[0], "unknown issue") is None
+
+
+def test_bid_codec_partial_bids(package, profile_a, domain00_bids):
+    codec = _module(package, "compact_bid").BidCodec(profile_a.getDomain())
+    issues = sorted(profile_a.getDomain().getIssues())
+    bid = domain00_bids[123]
+
+    partial = Bid({issue: bid.getValue(issue) for issue in issues[1:]})
+    compact = codec.encode(partial)
+    assert codec.value(compact, issues[0]) is None
+    assert codec.decode(compact) == partial
+    assert compact != codec.encode(bid)
+    assert codec.decode(codec.encode(Bid({}))) == Bid({})
+
+
+def test_best_bids_as_brute_force_sort(package, profile_a, domain00_bids):
+    best_bids = _module(package, "top_bids").best_bids
+    bids = list(best_bids(profile_a))
+
+    assert len(bids) == len(domain00_bids)
+    assert {bid for bid, _ in bids} == set(domain00_bids)
+    for bid, utility in bids[::37]:
+        assert utility == pytest.approx(profile_a.getUtility(bid))
+    expected = sorted((profile_a.getUtility(bid) for bid in domain00_bids), reverse=True)
+    assert [float(utility) for _, utility in bids] == pytest.approx([float(u) for u in expected])
+
+
+def test_best_bids_is_lazy(package, jobs_profile, jobs_bids):
+    top_bids = _module(package, "top_bids")
+    generated = []
+
+    def tracked():
+        for item in top_bids.best_bids(jobs_profile):
+            generated.append(item)
+            yield item
+
+    bids = top_bids.LazyList(tracked())
+    assert bids[2] == generated[2] and len(generated) == 3
+    assert bids[0] == generated[0] and len(generated) == 3
+    assert [item for _, item in zip(range(5), bids)] == generated[:5]
+    assert list(bids) == generated and len(generated) == len(jobs_bids)
+    with pytest.raises(IndexError):
+        bids[len(jobs_bids)]
+
+
+def _preferred(domain, bids, recent_ties: bool) -> dict:
+    """the preferred bid of an opponent by counting every issue in a dict"""
+    preferred = {}
+    for issue in domain.getIssues():
+        counts = Counter()
+        for bid in bids:
+            if bid.getValue(issue) is not None:
+                counts[bid.getValue(issue)] += 1
+        if recent_ties:
+            # the last of the counts in a dict, stably sorted on count
+            ranked = sorted(counts.items(), key=lambda item: item[1])
+            preferred[issue] = ranked[-1][0] if ranked else list(domain.getValues(issue))[-1]
+        else:
+            values = list(domain.getValues(issue))
+            preferred[issue] = max(values, key=lambda v: (counts[v], values.index(v)))
+    return preferred
+
+
+@pytest.mark.parametrize("recent_ties", [False, True])
+@pytest.mark.parametrize("seed", range(5))
+def test_opponent_model_as_counting(package, profile_a, domain00_bids, recent_ties, seed):
+    model_class = _module(package, "opponent_model").OpponentModel
+    domain = profile_a.getDomain()
+    rng = random.Random(seed)
+    # few distinct bids, so that there are many ties, and some bids that lack an issue
+    candidates = rng.sample(domain00_bids, 6)
+    issues = sorted(domain.getIssues())
+    candidates.append(Bid({issue: candidates[0].getValue(issue) for issue in issues[1:]}))
+
+    model = model_class(domain, recent_ties)
+    assert model.preferred_bid() == _preferred(domain, [], recent_ties)
+    received = []
+    for _ in range(40):
+        bid = rng.choice(candidates)
+        model.update(bid)
+        received.append(bid)
+        assert model.bid_count() == len(received)
+        assert model.preferred_bid() == _preferred(domain, received, recent_ties)
+
+    issue = issues[1]
+    for value in domain.getValues(issue):
+        assert model.value_count(issue, value) == sum(bid.getValue(issue) == value for bid in received)
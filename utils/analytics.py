@@ -0,0 +1,135 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from utils.result_store import ResultStore
+
+
+def _by_agent(
+    store: ResultStore, mask: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, dict]:
+    """Every session seen from both seats: the agent code of the seat and the
+    values for that seat, as flat arrays of length 2 * sessions (masked).
+    """
+    if mask is None:
+        mask = np.ones(len(store), dtype=bool)
+    agreement = store.column("result")[mask] == store.code("result", "agreement")
+    agents = np.concatenate(
+        [store.column("agent_1")[mask], store.column("agent_2")[mask]]
+    )
+    values = {
+        "opponent": np.concatenate(
+            [store.column("agent_2")[mask], store.column("agent_1")[mask]]
+        ),
+        "utility": np.concatenate(
+            [store.column("utility_1")[mask], store.column("utility_2")[mask]]
+        ),
+        "agreement": np.concatenate([agreement, agreement]).astype(float),
+    }
+    for column in ("nash_product", "social_welfare", "pareto_distance"):
+        values[column] = np.tile(store.column(column)[mask], 2)
+    return agents, values
+
+
+def grouped_mean(groups: np.ndarray, values: np.ndarray, size: int) -> np.ndarray:
+    """Mean of values per group (NaN values ignored), NaN for empty groups"""
+    valid = ~np.isnan(values)
+    counts = np.bincount(groups[valid], minlength=size)
+    sums = np.bincount(groups[valid], weights=values[valid], minlength=size)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return sums / counts
+
+
+def grouped_std(groups: np.ndarray, values: np.ndarray, size: int) -> np.ndarray:
+    """Population standard deviation of values per group, in two passes"""
+    means = grouped_mean(groups, values, size)
+    return np.sqrt(grouped_mean(groups, (values - means[groups]) ** 2, size))
+
+
+def grouped_median(groups: np.ndarray, values: np.ndarray, size: int) -> np.ndarray:
+    """Median of values per group: sort on group and value, then take the middle
+    element(s) of every group
+    """
+    order = np.lexsort((values, groups))
+    values = values[order]
+    counts = np.bincount(groups, minlength=size)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    medians = np.full(size, np.nan)
+    present = counts > 0
+    low = starts[present] + (counts[present] - 1) // 2
+    high = starts[present] + counts[present] // 2
+    medians[present] = (values[low] + values[high]) / 2
+    return medians
+
+
+def agent_statistics(
+    store: ResultStore, mask: Optional[np.ndarray] = None
+) -> Dict[str, dict]:
+    """Per agent: number of sessions, mean/median/std of its utility, agreement
+    rate, and mean nash_product, social_welfare and distance to the Pareto
+    front of its sessions. A session of an agent against itself counts for both
+    seats.
+    """
+    names = store.names("agent")
+    size = len(names)
+    agents, values = _by_agent(store, mask)
+    counts = np.bincount(agents, minlength=size)
+    statistics = {
+        "sessions": counts,
+        "mean_utility": grouped_mean(agents, values["utility"], size),
+        "median_utility": grouped_median(agents, values["utility"], size),
+        "std_utility": grouped_std(agents, values["utility"], size),
+        "agreement_rate": grouped_mean(agents, values["agreement"], size),
+        "mean_nash_product": grouped_mean(agents, values["nash_product"], size),
+        "mean_social_welfare": grouped_mean(agents, values["social_welfare"], size),
+        "mean_pareto_distance": grouped_mean(agents, values["pareto_distance"], size),
+    }
+    return {
+        name: {key: column[code].item() for key, column in statistics.items()}
+        for code, name in enumerate(names)
+        if counts[code]
+    }
+
+
+def head_to_head(
+    store: ResultStore, mask: Optional[np.ndarray] = None
+) -> Tuple[List[str], Dict[str, np.ndarray]]:
+    """Matrices with the agents as rows and their opponents as columns: number
+    of sessions, mean utility of the row agent and agreement rate.
+    """
+    names = store.names("agent")
+    size = len(names)
+    agents, values = _by_agent(store, mask)
+    pairs = agents * size + values["opponent"]
+    matrices = {
+        "sessions": np.bincount(pairs, minlength=size * size),
+        "mean_utility": grouped_mean(pairs, values["utility"], size * size),
+        "agreement_rate": grouped_mean(pairs, values["agreement"], size * size),
+    }
+    return names, {k: v.reshape(size, size) for k, v in matrices.items()}
+
+
+def agent_report(store: ResultStore, agent: str) -> dict:
+    """Statistics of one agent: overall, against every opponent and per domain"""
+    played = store.mask(agent=agent)
+    report = {
+        "agent": agent,
+        "sessions": int(played.sum()),
+        "no_agreement": int((played & ~store.mask(result="agreement")).sum()),
+        "overall": agent_statistics(store, played).get(agent, {}),
+        "opponents": {},
+        "domains": {},
+    }
+    names, matrices = head_to_head(store, played)
+    if agent in names:
+        row = names.index(agent)
+        for column, opponent in enumerate(names):
+            if matrices["sessions"][row, column]:
+                report["opponents"][opponent] = {
+                    k: v[row, column].item() for k, v in matrices.items()
+                }
+    for domain in store.names("domain"):
+        statistics = agent_statistics(store, played & store.mask(domain=domain))
+        if agent in statistics:
+            report["domains"][domain] = statistics[agent]
+    return report
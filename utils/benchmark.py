@@ -0,0 +1,215 @@
+import platform
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+from time import perf_counter
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from utils.planner import domain_size
+from utils.runners import run_session
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+# all agents in the agents directory, plus the Group27 agent
+AGENTS = [
+    "agents.boulware_agent.boulware_agent.BoulwareAgent",
+    "agents.conceder_agent.conceder_agent.ConcederAgent",
+    "agents.hardliner_agent.hardliner_agent.HardlinerAgent",
+    "agents.linear_agent.linear_agent.LinearAgent",
+    "agents.random_agent.random_agent.RandomAgent",
+    "agents.stupid_agent.stupid_agent.StupidAgent",
+    "agents.template_agent.agent_gosho.AgentGosho",
+    "agents.template_agent.agent_gosho_ascended.AgentGosho",
+    "agents.template_agent.agent_bat_gosho.AgentBatGosho",
+    "Group27_NegotiationAssignment_Project.Group27_NegotiationAssignment_Agent.Group27_NegotiationAssignment_Agent.Group27_NegotiationAssignment_Agent",
+]
+
+# the hardliner never concedes, so every session runs (close to) the full deadline
+OPPONENT = "agents.hardliner_agent.hardliner_agent.HardlinerAgent"
+
+DOMAINS = {
+    **{
+        f"domain{i:02d}": [
+            f"domains/domain{i:02d}/profileA.json",
+            f"domains/domain{i:02d}/profileB.json",
+        ]
+        for i in range(10)
+    },
+    "jobs": ["domains/jobs/jobsprofileA.json", "domains/jobs/jobsprofileB.json"],
+}
+
+# metrics that are compared against a baseline: (name, higher is worse, noise floor)
+METRICS = [
+    ("sessions_per_second", False, 0.0),
+    ("turn_ms.p50", True, 0.1),
+    ("turn_ms.p90", True, 0.1),
+    ("turn_ms.p99", True, 0.1),
+    ("setup_ms", True, 1.0),
+    ("peak_rss_mb", True, 5.0),
+]
+
+
+def run_benchmark(
+    agents: List[str] = AGENTS,
+    domains: Dict[str, List[str]] = DOMAINS,
+    sessions: int = 3,
+    deadline_rounds: int = 200,
+    opponent: str = OPPONENT,
+    seed: int = 0,
+) -> dict:
+    """Run every agent against the opponent on every domain and return the
+    benchmark report. The agent gets the first profile of the domain.
+
+    Every agent/domain cell runs in a fresh process, so the peak RSS of a cell
+    is not inflated by the cells before it, and its sessions are seeded with
+    fixed seeds so runs are reproducible.
+    """
+    results = []
+    for domain, profiles in domains.items():
+        size = domain_size(profiles)
+        for agent in agents:
+            print(f"benchmark: {agent.split('.')[-1]} on {domain} ({size} bids)")
+            with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as executor:
+                cell = executor.submit(
+                    _run_cell,
+                    agent,
+                    profiles,
+                    sessions,
+                    deadline_rounds,
+                    opponent,
+                    seed,
+                ).result()
+            results.append({"agent": agent, "domain": domain, "bids": size, **cell})
+
+    return {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "sessions": sessions,
+            "deadline_rounds": deadline_rounds,
+            "opponent": opponent,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def _run_cell(
+    agent: str,
+    profiles: List[str],
+    sessions: int,
+    deadline_rounds: int,
+    opponent: str,
+    seed: int,
+) -> dict:
+    turns, setup, outcomes = [], [], []
+    start = perf_counter()
+    for session in range(sessions):
+        random.seed(seed + session)
+        np.random.seed(seed + session)
+        _, results_summary = run_session(
+            {
+                "agents": [agent, opponent],
+                "profiles": profiles,
+                "deadline_rounds": deadline_rounds,
+                "timing": True,
+            }
+        )
+        outcomes.append(results_summary["result"])
+
+        # party names increase within a process, the agent is the lowest one
+        timing = results_summary["timing"]
+        parties = sorted(
+            (k for k in timing if k.startswith("agent_")),
+            key=lambda k: int(k.split("_")[-1]),
+        )
+        if parties:
+            agent_timing = timing[parties[0]]
+            turns.extend(agent_timing["turns"][1:])
+            setup.append(agent_timing["settings"] + agent_timing["first_turn"])
+    duration = perf_counter() - start
+
+    turns_ms = np.array(turns) * 1000
+    return {
+        "sessions": sessions,
+        "agreements": outcomes.count("agreement"),
+        "errors": outcomes.count("ERROR"),
+        "sessions_per_second": sessions / duration,
+        "turns": len(turns),
+        "turn_ms": {
+            f"p{p}": float(np.percentile(turns_ms, p)) if len(turns_ms) else 0.0
+            for p in (50, 90, 99)
+        },
+        "setup_ms": float(np.mean(setup)) * 1000 if setup else 0.0,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.2) -> List[str]:
+    """Compare a benchmark report with a baseline report and return a
+    description of every regression: a metric of an agent/domain cell that is
+    more than threshold (relative) worse than in the baseline. Differences below
+    the noise floor of a metric are ignored.
+    """
+    cells = {(r["agent"], r["domain"]): r for r in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        previous = cells.get((result["agent"], result["domain"]))
+        if previous is None:
+            continue
+        for metric, higher_is_worse, floor in METRICS:
+            old, new = _metric(previous, metric), _metric(result, metric)
+            if old is None or new is None:
+                continue
+            change = new - old if higher_is_worse else old - new
+            if change > floor and change > threshold * abs(old):
+                regressions.append(
+                    f"{result['agent'].split('.')[-1]} on {result['domain']}: "
+                    f"{metric} {old:.3f} -> {new:.3f}"
+                )
+    return regressions
+
+
+def _metric(result: dict, metric: str) -> Optional[float]:
+    value = result
+    for key in metric.split("."):
+        value = value.get(key) if isinstance(value, dict) else None
+    return value
+
+
+def print_report(report: dict):
+    """Print the report as a table, and the setup cost per domain size"""
+    print(
+        f"{'agent':<40} {'domain':<9} {'bids':>6} {'sess/s':>7} "
+        f"{'p50 ms':>7} {'p90 ms':>7} {'p99 ms':>7} {'setup ms':>9} {'rss MB':>7}"
+    )
+    for r in report["results"]:
+        rss = f"{r['peak_rss_mb']:.0f}" if r["peak_rss_mb"] is not None else "-"
+        print(
+            f"{r['agent'].split('.')[-1]:<40} {r['domain']:<9} {r['bids']:>6} "
+            f"{r['sessions_per_second']:>7.2f} {r['turn_ms']['p50']:>7.2f} "
+            f"{r['turn_ms']['p90']:>7.2f} {r['turn_ms']['p99']:>7.2f} "
+            f"{r['setup_ms']:>9.1f} {rss:>7}"
+        )
+
+    print("\nmean setup cost per domain size:")
+    sizes = sorted({(r["bids"], r["domain"]) for r in report["results"]})
+    for size, domain in sizes:
+        setup = [r["setup_ms"] for r in report["results"] if r["domain"] == domain]
+        print(f"  {domain:<9} {size:>6} bids: {np.mean(setup):8.1f} ms")
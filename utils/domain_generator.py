@@ -0,0 +1,153 @@
+import json
+import os
+from typing import List, Optional, Union
+
+import numpy as np
+
+from utils.pareto import specials_from_tables
+
+WEIGHT_DISTRIBUTIONS = ("uniform", "random", "skewed")
+
+
+def letters(index: int) -> str:
+    """Spreadsheet style name of an index: A, B, ..., Z, AA, AB, ..."""
+    name = ""
+    index += 1
+    while index > 0:
+        index, remainder = divmod(index - 1, 26)
+        name = chr(ord("A") + remainder) + name
+    return name
+
+
+def generate_domain(
+    name: str,
+    values: List[int],
+    weights: Union[str, List[float]] = "random",
+    seed: Optional[int] = None,
+) -> dict:
+    """Generate a domain with a profile for both sides, in the format of the
+    domains directory.
+
+    Args:
+        name (str): name of the domain.
+        values (List[int]): number of values of every issue, the domain has
+            prod(values) bids.
+        weights (Union[str, List[float]]): distribution of the issue weights of
+            both profiles: "uniform" (equal weights), "random" (uniform on the
+            simplex) or "skewed" (a few issues get most of the weight). A list of
+            weights is used as is for both profiles.
+        seed (Optional[int]): seed of the random generator.
+
+    Returns:
+        dict: the domain, profileA and profileB as they are stored in json.
+    """
+    if isinstance(weights, str) and weights not in WEIGHT_DISTRIBUTIONS:
+        raise ValueError(f"unknown weight distribution: {weights}")
+    if not isinstance(weights, str) and len(weights) != len(values):
+        raise ValueError("there must be one weight per issue")
+    if any(count < 1 for count in values):
+        raise ValueError("every issue needs at least one value")
+
+    rng = np.random.default_rng(seed)
+    issues = [f"issue{letters(i)}" for i in range(len(values))]
+    domain = {
+        "name": name,
+        "issuesValues": {
+            issue: {"values": [f"value{letters(v)}" for v in range(count)]}
+            for issue, count in zip(issues, values)
+        },
+    }
+
+    generated = {"domain": domain}
+    for profile_name in ("profileA", "profileB"):
+        issue_weights = _weights(rng, weights, len(issues))
+        generated[profile_name] = {
+            "LinearAdditiveUtilitySpace": {
+                "issueUtilities": {
+                    issue: {
+                        "DiscreteValueSetUtilities": {
+                            "valueUtilities": _value_utilities(
+                                rng, domain["issuesValues"][issue]["values"]
+                            )
+                        }
+                    }
+                    for issue in issues
+                },
+                "issueWeights": dict(zip(issues, issue_weights)),
+                "domain": domain,
+                "name": profile_name,
+            }
+        }
+    return generated
+
+
+def _weights(rng, distribution: Union[str, List[float]], count: int) -> List[float]:
+    if not isinstance(distribution, str):
+        return list(distribution)
+    if distribution == "uniform":
+        weights = np.full(count, 1 / count)
+    elif distribution == "random":
+        weights = rng.dirichlet(np.ones(count))
+    else:
+        weights = rng.dirichlet(np.full(count, 0.3))
+    # rounded like the shipped profiles, never below 0, and the rounding remainder
+    # goes to the largest weight, which is at least 1 / count so it stays positive
+    rounded = [max(round(float(w), 5), 0.0) for w in weights]
+    largest = rounded.index(max(rounded))
+    rounded[largest] = round(rounded[largest] + 1 - sum(rounded), 5)
+    assert all(w >= 0 for w in rounded) and abs(sum(rounded) - 1) < 1e-9, rounded
+    return rounded
+
+
+def _value_utilities(rng, values: List[str]) -> dict:
+    # the best value of every issue has utility 1, like in the shipped profiles
+    utilities = rng.random(len(values))
+    utilities /= utilities.max()
+    return {value: round(float(u), 5) for value, u in zip(values, utilities)}
+
+
+def compute_specials(profile_a: dict, profile_b: dict) -> dict:
+    """Compute the specials of two profiles as stored in json, issues taken in
+    sorted order like utils.pareto.compute_specials does for profile objects.
+    """
+    spaces = [p["LinearAdditiveUtilitySpace"] for p in (profile_a, profile_b)]
+    issues_values = spaces[0]["domain"]["issuesValues"]
+    issues = sorted(issues_values)
+    values = [issues_values[issue]["values"] for issue in issues]
+
+    def weighted(space: dict) -> List[List[float]]:
+        return [
+            [
+                space["issueWeights"][issue]
+                * space["issueUtilities"][issue]["DiscreteValueSetUtilities"][
+                    "valueUtilities"
+                ][v]
+                for v in issue_values
+            ]
+            for issue, issue_values in zip(issues, values)
+        ]
+
+    return specials_from_tables(
+        issues, values, weighted(spaces[0]), weighted(spaces[1])
+    )
+
+
+def write_domain(generated: dict, directory: str, specials: bool = True):
+    """Write a generated domain to a directory, in the layout of the domains
+    directory: <name>.json, profileA.json, profileB.json and specials.json.
+    """
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+
+    files = {
+        f"{generated['domain']['name']}.json": generated["domain"],
+        "profileA.json": generated["profileA"],
+        "profileB.json": generated["profileB"],
+    }
+    if specials:
+        files["specials.json"] = compute_specials(
+            generated["profileA"], generated["profileB"]
+        )
+    for file_name, content in files.items():
+        with open(os.path.join(directory, file_name), "w") as f:
+            f.write(json.dumps(content, indent=2))
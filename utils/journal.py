@@ -0,0 +1,82 @@
+import json
+import os
+from typing import Dict
+
+
+def session_key(settings: dict) -> str:
+    """Key that identifies a session in the journal: the agent duo, the profile
+    set, the deadline and the agent parameters.
+    """
+    return json.dumps(
+        [
+            settings["agents"],
+            settings["profiles"],
+            settings["deadline_rounds"],
+            settings.get("parameters"),
+        ]
+    )
+
+
+class ResultsJournal:
+    """
+    Append-only JSONL file with one line per finished session. Every line is
+    flushed to disk as soon as it is written, so a crashed or interrupted
+    tournament can be resumed by skipping the sessions that are in the journal.
+    """
+
+    def __init__(self, path: str, resume: bool = False):
+        """
+        Args:
+            path (str): location of the journal file.
+            resume (bool): keep the existing journal and append to it, otherwise
+                a new journal is started.
+        """
+        self._path = path
+        self._resume = resume
+        self._file = None
+
+    def __enter__(self) -> "ResultsJournal":
+        directory = os.path.dirname(self._path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        if self._resume and os.path.exists(self._path):
+            self._file = open(self._path, "a+")
+            # a crash during a write leaves a partial line, start on a new line
+            self._file.seek(0, os.SEEK_END)
+            if self._file.tell() > 0:
+                self._file.seek(self._file.tell() - 1)
+                if self._file.read(1) != "\n":
+                    self._file.write("\n")
+        else:
+            self._file = open(self._path, "w")
+        return self
+
+    def __exit__(self, *exc):
+        self._file.close()
+        self._file = None
+
+    def load(self) -> Dict[str, dict]:
+        """Read the journal and return the results summaries by session key. A
+        partially written last line is ignored.
+        """
+        results_summaries = {}
+        if not self._resume or not os.path.exists(self._path):
+            return results_summaries
+
+        with open(self._path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                results_summaries[session_key(entry["settings"])] = entry[
+                    "results_summary"
+                ]
+        return results_summaries
+
+    def append(self, settings: dict, results_summary: dict):
+        entry = {"settings": settings, "results_summary": results_summary}
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
@@ -0,0 +1,216 @@
+import json
+import os
+from functools import lru_cache
+from math import prod
+from typing import List, Optional, Sequence
+
+import numpy as np
+from geniusweb.profile.utilityspace.LinearAdditive import LinearAdditive
+
+# bids that are enumerated at once, bounds the memory use on huge domains
+CHUNK_SIZE = 1 << 20
+
+
+def pareto_front(util_a: np.ndarray, util_b: np.ndarray) -> np.ndarray:
+    """Sort-and-sweep Pareto front of a set of bids.
+
+    The bids are sorted on utility of A descending (ties on utility of B
+    descending, then on position). Walking that order, a bid is on the front when
+    its utility for B is higher than that of every bid before it, which is a
+    running maximum. Of bids with identical utilities only the first is kept.
+
+    Returns:
+        np.ndarray: positions of the bids on the front, utility of A ascending.
+    """
+    order = np.lexsort((-util_b, -util_a))
+    sorted_b = util_b[order]
+    best_before = np.maximum.accumulate(np.concatenate(([-np.inf], sorted_b[:-1])))
+    return order[sorted_b > best_before][::-1]
+
+
+def kalai_point(util_a: np.ndarray, util_b: np.ndarray, front: np.ndarray) -> int:
+    """Position of the bid on the front where both utilities are closest"""
+    return int(front[np.argmin(np.abs(util_a[front] - util_b[front]))])
+
+
+def specials_from_tables(
+    issues: List[str],
+    values: List[List[str]],
+    weighted_a: List[Sequence[float]],
+    weighted_b: List[Sequence[float]],
+    chunk_size: int = CHUNK_SIZE,
+) -> dict:
+    """Compute the specials (Nash, Kalai and Pareto front) of a domain.
+
+    The bids are enumerated in chunks, by decoding bid numbers in mixed radix
+    (first issue most significant). The utility of a bid is the sum of the
+    weighted utilities of its values, added in issue order, exactly as in the
+    specials.json files of the domains. Only the Pareto front of every chunk is
+    kept, as a bid that is dominated in its chunk is not on the front of the
+    domain, so the memory use does not grow with the domain.
+
+    Args:
+        issues (List[str]): names of the issues, in the order of the bids.
+        values (List[List[str]]): names of the values of every issue.
+        weighted_a (List[Sequence[float]]): weight * utility of every value of
+            every issue, for profile A.
+        weighted_b (List[Sequence[float]]): same for profile B.
+        chunk_size (int): number of bids enumerated at once.
+
+    Returns:
+        dict: the specials, in the format of specials.json.
+    """
+    radices = [len(v) for v in values]
+    weighted_a = [np.asarray(w, dtype=float) for w in weighted_a]
+    weighted_b = [np.asarray(w, dtype=float) for w in weighted_b]
+
+    candidates, nash, nash_product = [], 0, -np.inf
+    for start in range(0, prod(radices), chunk_size):
+        numbers = np.arange(start, min(start + chunk_size, prod(radices)))
+        util_a, util_b = np.zeros(len(numbers)), np.zeros(len(numbers))
+        digits = _digits(numbers, radices)
+        for i in range(len(issues)):
+            util_a = util_a + weighted_a[i][digits[i]]
+            util_b = util_b + weighted_b[i][digits[i]]
+
+        # the first bid with the highest product wins, like np.argmax
+        products = util_a * util_b
+        best = int(np.argmax(products))
+        if products[best] > nash_product:
+            nash, nash_product = int(numbers[best]), products[best]
+
+        # keep the front of the chunk in bid order, so ties still go to the first bid
+        front = np.sort(pareto_front(util_a, util_b))
+        candidates.append((numbers[front], util_a[front], util_b[front]))
+
+    numbers, util_a, util_b = (np.concatenate(c) for c in zip(*candidates))
+    front = pareto_front(util_a, util_b)
+    kalai = kalai_point(util_a, util_b, front)
+
+    def special(number: int) -> dict:
+        digits = _digits(np.array([number]), radices)
+        return {
+            "bid": {issue: values[i][digits[i][0]] for i, issue in enumerate(issues)},
+            "utility": [
+                _utility(weighted_a, digits),
+                _utility(weighted_b, digits),
+            ],
+        }
+
+    return {
+        "nash": special(nash),
+        "kalai": special(int(numbers[kalai])),
+        "pareto_front": [special(int(numbers[position])) for position in front],
+    }
+
+
+def _digits(numbers: np.ndarray, radices: List[int]) -> List[np.ndarray]:
+    digits = [None] * len(radices)
+    remainder = numbers
+    for i in reversed(range(len(radices))):
+        remainder, digits[i] = np.divmod(remainder, radices[i])
+    return digits
+
+
+def _utility(weighted: List[np.ndarray], digits: List[np.ndarray]) -> float:
+    utility = 0.0
+    for table, digit in zip(weighted, digits):
+        utility = utility + float(table[digit[0]])
+    return utility
+
+
+def compute_specials(
+    profile_a: LinearAdditive, profile_b: LinearAdditive, chunk_size: int = CHUNK_SIZE
+) -> dict:
+    """Compute the specials of two profiles on the same domain. Issues are
+    taken in sorted order, values in domain order.
+    """
+    domain = profile_a.getDomain()
+    issues = sorted(domain.getIssues())
+    values = [list(domain.getValues(issue)) for issue in issues]
+
+    def weighted(profile: LinearAdditive) -> List[List[float]]:
+        utilities = profile.getUtilities()
+        return [
+            [
+                float(profile.getWeight(issue)) * float(utilities[issue].getUtility(v))
+                for v in issue_values
+            ]
+            for issue, issue_values in zip(issues, values)
+        ]
+
+    return specials_from_tables(
+        issues,
+        [[v.getValue() for v in issue_values] for issue_values in values],
+        weighted(profile_a),
+        weighted(profile_b),
+        chunk_size,
+    )
+
+
+def write_specials(specials: dict, path: str):
+    """Write specials in the format of the specials.json files of the domains"""
+    with open(path, "w") as f:
+        f.write(json.dumps(specials, indent=2))
+
+
+
+class Specials:
+    """
+    The Pareto front, Nash and Kalai point of a domain, as arrays of utilities,
+    to measure how close an outcome is to them. The front is sorted on
+    utility of A ascending.
+    """
+
+    def __init__(self, specials: dict):
+        front = np.array([point["utility"] for point in specials["pareto_front"]])
+        self._front = front.reshape(-1, 2)
+        self._nash = np.array(specials["nash"]["utility"], dtype=float)
+        self._kalai = np.array(specials["kalai"]["utility"], dtype=float)
+
+    def swapped(self) -> "Specials":
+        """The same specials with the utilities of A and B swapped"""
+        swapped = object.__new__(Specials)
+        swapped._front = self._front[::-1, ::-1]
+        swapped._nash = self._nash[::-1]
+        swapped._kalai = self._kalai[::-1]
+        return swapped
+
+    def distances(self, util_a: float, util_b: float) -> dict:
+        """Euclidean distances in utility space of an outcome to the nearest bid
+        on the Pareto front, to the Nash point and to the Kalai point
+        """
+        outcome = np.array([util_a, util_b])
+        return {
+            "pareto_distance": float(np.min(np.hypot(*(self._front - outcome).T))),
+            "nash_distance": float(np.hypot(*(self._nash - outcome))),
+            "kalai_distance": float(np.hypot(*(self._kalai - outcome))),
+        }
+
+
+@lru_cache(maxsize=64)
+def load_specials(path: str) -> Specials:
+    """Load a specials.json file, once per process"""
+    with open(path) as f:
+        return Specials(json.load(f))
+
+
+def get_specials(profile_uris: List[str]) -> Optional[Specials]:
+    """The specials of the domain of a profile pair, oriented so that A is the
+    first profile of the pair. Returns None when the domain has no
+    specials.json, or the profiles are not the A and B profile of one domain.
+    """
+    if not all(uri.startswith("file:") for uri in profile_uris):
+        return None
+    paths = [os.path.normpath(uri[len("file:") :]) for uri in profile_uris]
+    directory = os.path.dirname(paths[0])
+    specials_path = os.path.join(directory, "specials.json")
+    if os.path.dirname(paths[1]) != directory or not os.path.exists(specials_path):
+        return None
+
+    sides = [os.path.basename(path).endswith("profileA.json") for path in paths]
+    if sides == [True, False]:
+        return load_specials(specials_path)
+    if sides == [False, True]:
+        return load_specials(specials_path).swapped()
+    return None
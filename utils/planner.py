@@ -0,0 +1,152 @@
+import json
+import os
+from functools import lru_cache
+from math import prod
+from statistics import median
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# benchmark report that is used as cost history when the settings name none
+DEFAULT_HISTORY = "results/benchmark.json"
+# session cost when there is no history at all: 1 second per 200 rounds
+DEFAULT_SECONDS_PER_ROUND = 0.005
+
+
+def domain_size(profiles: List[str]) -> int:
+    """Number of bids in the domain of a profile set, read from the profile"""
+    return _domain_size(profiles[0])
+
+
+@lru_cache(maxsize=None)
+def _domain_size(path: str) -> int:
+    # a tournament plans many sessions on the same profiles, so every file is only read once
+    with open(path) as f:
+        domain = json.load(f)["LinearAdditiveUtilitySpace"]["domain"]
+    return prod(len(issue["values"]) for issue in domain["issuesValues"].values())
+
+
+class CostModel:
+    """
+    Estimates the wall time of a session from benchmark history (a report of
+    run_benchmark.py). For every agent the benchmark gives the seconds per
+    session on domains of several sizes; the cost on another size comes from a
+    least-squares line through these points (seconds per round against the
+    number of bids), extrapolated beyond the benchmarked sizes but never below
+    the cheapest observation, and scaled by the number of rounds.
+
+    A session costs the mean of the costs of its two agents, as in the benchmark
+    both agents played against the same opponent. Agents that are not in the
+    history cost the median of the known agents.
+    """
+
+    def __init__(self, history: Optional[dict] = None):
+        # per agent: (number of bids, seconds per round) of every benchmark cell
+        self._points: Dict[str, List[Tuple[int, float]]] = {}
+        if history:
+            rounds = history["meta"]["deadline_rounds"]
+            for cell in history["results"]:
+                if cell["sessions_per_second"] > 0:
+                    seconds = 1 / cell["sessions_per_second"] / rounds
+                    self._points.setdefault(cell["agent"], []).append(
+                        (cell["bids"], seconds)
+                    )
+
+    @staticmethod
+    def load(path: Optional[str]) -> "CostModel":
+        """Cost model of a benchmark report, without history if the file does
+        not exist
+        """
+        if path and os.path.exists(path):
+            with open(path) as f:
+                return CostModel(json.load(f))
+        return CostModel()
+
+    def has_history(self) -> bool:
+        return bool(self._points)
+
+    def seconds_per_round(self, agent: str, bids: int) -> float:
+        if agent not in self._points:
+            if not self._points:
+                return DEFAULT_SECONDS_PER_ROUND
+            return median(self.seconds_per_round(a, bids) for a in self._points)
+
+        sizes, seconds = np.array(self._points[agent], dtype=float).T
+        if len(np.unique(sizes)) < 2:
+            return float(seconds.mean())
+        slope, intercept = np.polyfit(sizes, seconds, 1)
+        # never estimate below the cheapest observation
+        return max(float(slope * bids + intercept), float(seconds.min()))
+
+    def session_seconds(self, settings: dict) -> float:
+        bids = domain_size(settings["profiles"])
+        per_round = [self.seconds_per_round(a, bids) for a in settings["agents"]]
+        return sum(per_round) / len(per_round) * settings["deadline_rounds"]
+
+
+class TournamentPlan:
+    """
+    The sessions of a tournament that will run, with their estimated wall time.
+    Sessions are taken in tournament order until the budget (max_sessions
+    and/or max_minutes, in estimated wall time over all workers) is used up.
+    """
+
+    def __init__(
+        self,
+        sessions: List[dict],
+        estimates: List[float],
+        workers: int = 1,
+        budget: Optional[dict] = None,
+        has_history: bool = True,
+    ):
+        self.sessions = sessions
+        self.estimates = estimates
+        self.workers = max(1, workers)
+        self.budget = budget or {}
+        self.has_history = has_history
+
+        max_sessions = self.budget.get("max_sessions")
+        max_minutes = self.budget.get("max_minutes")
+        selected, seconds = [], 0.0
+        for index, estimate in enumerate(estimates):
+            if max_sessions is not None and len(selected) >= max_sessions:
+                break
+            if (
+                max_minutes is not None
+                and (seconds + estimate) / self.workers > max_minutes * 60
+            ):
+                break
+            selected.append(index)
+            seconds += estimate
+        self.selected = selected
+
+    def estimated_minutes(self) -> float:
+        """Estimated wall time of the selected sessions"""
+        return sum(self.estimates[i] for i in self.selected) / self.workers / 60
+
+    def describe(self) -> str:
+        text = (
+            f"planned {len(self.selected)} of {len(self.sessions)} sessions, "
+            f"estimated {self.estimated_minutes():.1f} minutes on {self.workers} worker(s)"
+        )
+        if not self.has_history:
+            text += " (no benchmark history, run run_benchmark.py for better estimates)"
+        return text
+
+
+def plan_sessions(sessions: List[dict], tournament_settings: dict) -> TournamentPlan:
+    """Plan the sessions of a tournament with the budget and cost history of the
+    tournament settings:
+
+        "budget": {"max_sessions": 500, "max_minutes": 30}
+        "history": "results/benchmark.json"
+    """
+    model = CostModel.load(tournament_settings.get("history", DEFAULT_HISTORY))
+    workers = tournament_settings.get("workers", 1) or os.cpu_count()
+    return TournamentPlan(
+        sessions,
+        [model.session_seconds(settings) for settings in sessions],
+        workers,
+        tournament_settings.get("budget"),
+        model.has_history(),
+    )
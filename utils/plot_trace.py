@@ -1,10 +1,32 @@
+import json
 import os
 from collections import defaultdict
+from typing import Optional
 
+import numpy as np
 import plotly.graph_objects as go
 
+# traces with more actions than this are plotted in scalable mode by default
+SCALABLE_THRESHOLD = 2000
+
+
+def plot_trace(
+    results_trace: dict,
+    plot_file: str,
+    scalable: Optional[bool] = None,
+    max_points: int = 1000,
+):
+    """Plot the utilities of all offers in a trace to a html file.
+
+    Long traces are plotted in scalable mode (see plot_trace_scalable), which is
+    used by default for traces with more than SCALABLE_THRESHOLD actions.
+    """
+    if scalable is None:
+        scalable = len(results_trace["actions"]) > SCALABLE_THRESHOLD
+    if scalable:
+        plot_trace_scalable(results_trace, plot_file, max_points)
+        return
 
-def plot_trace(results_trace: dict, plot_file: str):
     utilities = defaultdict(lambda: defaultdict(lambda: {"x": [], "y": [], "bids": []}))
     accept = {"x": [], "y": [], "bids": []}
     for index, action in enumerate(results_trace["actions"], 1):
@@ -73,3 +95,147 @@ def plot_trace(results_trace: dict, plot_file: str):
     fig.update_xaxes(title_text="round", range=[0, index + 1], ticks="outside")
     fig.update_yaxes(title_text="utility", range=[0, 1], ticks="outside")
     fig.write_html(f"{os.path.splitext(plot_file)[0]}.html")
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets downsampling: the indices of at most
+    threshold points that keep the visual shape of the line. The first and last
+    point are always kept, in between every bucket keeps the point that forms the
+    largest triangle with the point kept before and the mean of the next bucket.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # bucket edges of the points between the first and the last one
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    selected = np.empty(threshold, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for i in range(threshold - 2):
+        start, stop = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_x = x[edges[i + 1] : edges[i + 2]].mean()
+            next_y = y[edges[i + 1] : edges[i + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        # twice the triangle areas, the constant factor does not change the argmax
+        areas = np.abs(
+            (x[previous] - next_x) * (y[start:stop] - y[previous])
+            - (x[previous] - x[start:stop]) * (next_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        selected[i + 1] = previous
+    return selected
+
+
+def downsampling_error(x: np.ndarray, y: np.ndarray, kept: np.ndarray) -> float:
+    """Largest absolute difference between the points of a line and the line
+    through the kept points, the error bound of the plotted line
+    """
+    if len(kept) == len(x):
+        return 0.0
+    return float(np.max(np.abs(y - np.interp(x, x[kept], y[kept]))))
+
+
+def plot_trace_scalable(results_trace: dict, plot_file: str, max_points: int = 1000):
+    """Plot a (long) trace with WebGL scatter plots.
+
+    Every line is downsampled to at most max_points with LTTB, and hover text is
+    only created for the points that are kept. The full resolution data is
+    written to a compact sidecar file (<plot_file>_data.npz) next to the html
+    file, with a json that describes the series and the error bound of every plotted
+    line.
+    """
+    actions = results_trace["actions"]
+    # per receiving agent and actor: round numbers, utilities and action indices
+    series = defaultdict(lambda: defaultdict(lambda: ([], [], [])))
+    accept = None
+    for index, action in enumerate(actions, 1):
+        if "Offer" in action:
+            offer = action["Offer"]
+            for agent, util in offer["utilities"].items():
+                x, y, source = series[agent][offer["actor"]]
+                x.append(index)
+                y.append(util)
+                source.append(index - 1)
+        elif "Accept" in action:
+            accept = (index - 1, action["Accept"])
+
+    fig = go.Figure()
+    if accept:
+        index, offer = accept
+        fig.add_trace(
+            go.Scattergl(
+                mode="markers",
+                x=[index] * len(offer["utilities"]),
+                y=list(offer["utilities"].values()),
+                name="agreement",
+                marker={"color": "green", "size": 15},
+                hoverinfo="skip",
+            )
+        )
+
+    base = os.path.splitext(plot_file)[0]
+    sidecar, description = {}, []
+    color = {0: "red", 1: "blue"}
+    for i, (agent, data) in enumerate(series.items()):
+        for actor, (x, y, source) in data.items():
+            x, y, source = np.array(x), np.array(y), np.array(source)
+            kept = lttb(x, y, max_points)
+
+            # hover text is only created for the points that are plotted
+            text = []
+            for position in kept:
+                offer = actions[source[position]]["Offer"]
+                text.append(
+                    "<br>".join(
+                        [f"<b>utility: {y[position]:.3f}</b><br>"]
+                        + [f"{i}: {v}" for i, v in offer["bid"]["issuevalues"].items()]
+                    )
+                )
+
+            name = "_".join(agent.split("_")[-2:])
+            fig.add_trace(
+                go.Scattergl(
+                    mode="lines+markers" if agent == actor else "markers",
+                    x=x[kept],
+                    y=y[kept],
+                    name=f"{name} offered" if agent == actor else f"{name} received",
+                    legendgroup=agent,
+                    marker={"color": color[i]},
+                    hovertext=text,
+                    hoverinfo="text",
+                )
+            )
+
+            key = f"s{len(description)}"
+            sidecar[f"{key}_round"] = x.astype(np.int32)
+            sidecar[f"{key}_utility"] = y.astype(np.float32)
+            description.append(
+                {
+                    "key": key,
+                    "agent": agent,
+                    "actor": actor,
+                    "points": len(x),
+                    "plotted": len(kept),
+                    "max_error": downsampling_error(x, y, kept),
+                }
+            )
+
+    fig.update_layout(
+        height=800,
+        legend={
+            "yanchor": "bottom",
+            "y": 1,
+            "xanchor": "left",
+            "x": 0,
+        },
+    )
+    fig.update_xaxes(title_text="round", range=[0, len(actions) + 1], ticks="outside")
+    fig.update_yaxes(title_text="utility", range=[0, 1], ticks="outside")
+    fig.write_html(f"{base}.html")
+
+    np.savez_compressed(f"{base}_data.npz", **sidecar)
+    with open(f"{base}_data.json", "w") as f:
+        f.write(json.dumps({"actions": len(actions), "series": description}, indent=2))
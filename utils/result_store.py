@@ -0,0 +1,267 @@
+import json
+import os
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from utils.result_writer import iter_results
+
+# columns of the store: name -> dtype, names of dictionary encoded columns map to
+# the dictionary they are encoded with
+COLUMNS = {
+    "agent_1": np.int32,
+    "agent_2": np.int32,
+    "domain": np.int32,
+    "result": np.int32,
+    "utility_1": np.float64,
+    "utility_2": np.float64,
+    "num_offers": np.int32,
+    "nash_product": np.float64,
+    "social_welfare": np.float64,
+    "pareto_distance": np.float64,
+    "nash_distance": np.float64,
+    "kalai_distance": np.float64,
+}
+ENCODED = {
+    "agent_1": "agent",
+    "agent_2": "agent",
+    "domain": "domain",
+    "result": "result",
+}
+
+# rows that are buffered in memory before they are written to disk
+CHUNK_SIZE = 1 << 16
+
+
+def session_row(settings: dict, results_summary: dict) -> dict:
+    """Flatten a session into a row of the store. The agents and utilities are
+    stored by seat (agent_1 is the agent with the first profile), whatever the
+    party numbers in the summary are, and the domain is the directory of the
+    profiles.
+    """
+    parties = sorted(
+        (k.split("_")[-1] for k in results_summary if k.startswith("agent_")),
+        key=int,
+    )
+    row = {
+        "domain": os.path.basename(os.path.dirname(settings["profiles"][0])),
+        "result": results_summary["result"],
+    }
+    for seat, party in enumerate(parties, 1):
+        row[f"agent_{seat}"] = results_summary[f"agent_{party}"]
+        row[f"utility_{seat}"] = results_summary[f"utility_{party}"]
+    for column in COLUMNS:
+        if column not in row:
+            row[column] = results_summary.get(
+                column, 0 if column == "num_offers" else np.nan
+            )
+    return row
+
+
+class ResultStoreWriter:
+    """
+    Writes tournament results to a directory as a columnar store: one .npy file
+    per column, and a dictionaries.json with the names behind the dictionary
+    encoded columns (agents, domains and results). Rows are written to disk in
+    chunks while they are appended, so memory stays flat.
+    """
+
+    def __init__(self, directory: str):
+        self._directory = directory
+        self._dictionaries: Dict[str, Dict[str, int]] = {
+            name: {} for name in dict.fromkeys(ENCODED.values())
+        }
+        self._buffer: Dict[str, list] = {column: [] for column in COLUMNS}
+        self._spool = {}
+        self._rows = 0
+
+    def __enter__(self) -> "ResultStoreWriter":
+        if not os.path.exists(self._directory):
+            os.makedirs(self._directory)
+        # the columns are spooled as raw arrays, and turned into .npy files at the end
+        self._spool = {
+            column: open(self._path(column, ".spool"), "wb") for column in COLUMNS
+        }
+        return self
+
+    def __exit__(self, *exc):
+        self._flush()
+        for column, dtype in COLUMNS.items():
+            self._spool[column].close()
+            stored = np.lib.format.open_memmap(
+                self._path(column, ".npy"), mode="w+", dtype=dtype, shape=(self._rows,)
+            )
+            if self._rows:
+                spool = np.memmap(self._path(column, ".spool"), dtype=dtype, mode="r")
+                for start in range(0, self._rows, CHUNK_SIZE):
+                    stored[start : start + CHUNK_SIZE] = spool[
+                        start : start + CHUNK_SIZE
+                    ]
+                del spool
+            stored.flush()
+            del stored
+            os.remove(self._path(column, ".spool"))
+
+        with open(os.path.join(self._directory, "dictionaries.json"), "w") as f:
+            f.write(
+                json.dumps(
+                    {k: list(v) for k, v in self._dictionaries.items()}, indent=2
+                )
+            )
+
+    def _path(self, column: str, extension: str) -> str:
+        return os.path.join(self._directory, column + extension)
+
+    def append(self, settings: dict, results_summary: dict):
+        row = session_row(settings, results_summary)
+        for column in COLUMNS:
+            value = row[column]
+            if column in ENCODED:
+                dictionary = self._dictionaries[ENCODED[column]]
+                value = dictionary.setdefault(value, len(dictionary))
+            self._buffer[column].append(value)
+        self._rows += 1
+        if len(self._buffer["result"]) >= CHUNK_SIZE:
+            self._flush()
+
+    def _flush(self):
+        for column, dtype in COLUMNS.items():
+            np.asarray(self._buffer[column], dtype=dtype).tofile(self._spool[column])
+            self._buffer[column] = []
+
+
+def build_store(directory: str, sessions: Iterable[Tuple[dict, dict]]) -> "ResultStore":
+    """Write (settings, results_summary) pairs to a store and open it"""
+    with ResultStoreWriter(directory) as writer:
+        for settings, results_summary in sessions:
+            writer.append(settings, results_summary)
+    return ResultStore(directory)
+
+
+def stored_sessions(
+    tournament_file: str, summaries_file: str
+) -> Iterator[Tuple[dict, dict]]:
+    """(settings, results_summary) pairs of a tournament that was saved by
+    run_tournament.py, to convert it with build_store
+    """
+    return zip(iter_results(tournament_file), iter_results(summaries_file))
+
+
+def aggregate(values: np.ndarray) -> dict:
+    """Count, mean, standard deviation, min and max of values, NaN ignored"""
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return {"count": 0}
+    return {
+        "count": int(len(values)),
+        "mean": float(values.mean()),
+        "std": float(values.std()),
+        "min": float(values.min()),
+        "max": float(values.max()),
+    }
+
+
+class ResultStore:
+    """
+    Read side of a columnar store. Columns are memory mapped on first use, so
+    filtering and aggregating millions of sessions only touches the columns that
+    are needed, without creating a dict per session.
+    """
+
+    def __init__(self, directory: str):
+        self._directory = directory
+        with open(os.path.join(directory, "dictionaries.json")) as f:
+            self._dictionaries: Dict[str, List[str]] = json.load(f)
+        self._columns: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.column("result"))
+
+    def column(self, name: str) -> np.ndarray:
+        """The raw column, dictionary encoded columns hold codes"""
+        if name not in self._columns:
+            path = os.path.join(self._directory, f"{name}.npy")
+            self._columns[name] = np.load(path, mmap_mode="r")
+        return self._columns[name]
+
+    def names(self, dictionary: str) -> List[str]:
+        """The names of a dictionary: agent, domain or result"""
+        return self._dictionaries[dictionary]
+
+    def code(self, dictionary: str, name: str) -> int:
+        """Code of a name in a dictionary, -1 if it does not occur in the store"""
+        names = self._dictionaries[dictionary]
+        return names.index(name) if name in names else -1
+
+    def decode(self, column: str, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """The names in a dictionary encoded column"""
+        codes = self.column(column) if mask is None else self.column(column)[mask]
+        return np.array(self.names(ENCODED[column]), dtype=object)[codes]
+
+    def mask(
+        self,
+        agent: Optional[str] = None,
+        opponent: Optional[str] = None,
+        domain: Optional[str] = None,
+        result: Optional[str] = None,
+    ) -> np.ndarray:
+        """Boolean mask of the sessions that match all the given filters. agent
+        matches either seat, opponent is the agent in the other seat.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if agent is not None:
+            mask &= self.seat_mask(agent, opponent).any(axis=0)
+        elif opponent is not None:
+            mask &= self.seat_mask(opponent).any(axis=0)
+        if domain is not None:
+            mask &= self.column("domain") == self.code("domain", domain)
+        if result is not None:
+            mask &= self.column("result") == self.code("result", result)
+        return mask
+
+    def seat_mask(self, agent: str, opponent: Optional[str] = None) -> np.ndarray:
+        """Boolean masks of shape (2, sessions): row 0 where the agent is in
+        seat 1, row 1 where it is in seat 2 (against the opponent, if given).
+        """
+        code = self.code("agent", agent)
+        seats = np.stack(
+            [self.column("agent_1") == code, self.column("agent_2") == code]
+        )
+        if opponent is not None:
+            other = self.code("agent", opponent)
+            seats &= np.stack(
+                [self.column("agent_2") == other, self.column("agent_1") == other]
+            )
+        return seats
+
+    def agent_utilities(
+        self, agent: str, mask: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Utility of the agent in every matching session it played, whatever its
+        seat. A session of the agent against itself counts twice.
+        """
+        seats = self.seat_mask(agent)
+        if mask is not None:
+            seats &= mask
+        return np.concatenate(
+            [self.column("utility_1")[seats[0]], self.column("utility_2")[seats[1]]]
+        )
+
+    def records(self, mask: Optional[np.ndarray] = None) -> Iterator[dict]:
+        """The matching sessions as dicts, with the agents and utilities by seat
+        (agent_1, agent_2, utility_1 and utility_2), missing values are None
+        """
+        indices = np.flatnonzero(mask) if mask is not None else range(len(self))
+        for index in indices:
+            record = {}
+            for column in COLUMNS:
+                value = self.column(column)[index]
+                if column in ENCODED:
+                    record[column] = self.names(ENCODED[column])[value]
+                elif np.isnan(value):
+                    # missing values, e.g. distances of domains without specials
+                    record[column] = None
+                else:
+                    record[column] = value.item()
+            yield record
@@ -0,0 +1,84 @@
+import gzip
+import json
+import os
+from typing import IO, Iterable, Iterator
+
+
+def _open(path: str, mode: str) -> IO[str]:
+    """Open a text file, gzip compressed when the path ends with .gz"""
+    directory = os.path.dirname(path)
+    if "w" in mode and directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode)
+
+
+def _is_jsonl(path: str) -> bool:
+    if path.endswith(".gz"):
+        path = path[: -len(".gz")]
+    return path.endswith(".jsonl")
+
+
+class ResultsWriter:
+    """
+    Writes records (session settings, summaries or traces) to a file one at a
+    time, so a tournament never has to keep all of them in memory or build one
+    huge string at the end.
+
+    The format follows the extension of the path: .jsonl writes one JSON object
+    per line, anything else a JSON array that is indented exactly like
+    json.dumps(records, indent=2). A .gz suffix (e.g. results.jsonl.gz) compresses
+    the file.
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+        self._jsonl = _is_jsonl(path)
+        self._file = None
+        self._count = 0
+
+    def __enter__(self) -> "ResultsWriter":
+        self._file = _open(self._path, "w")
+        return self
+
+    def __exit__(self, *exc):
+        if not self._jsonl:
+            self._file.write("\n]" if self._count else "[]")
+        self._file.close()
+        self._file = None
+
+    def write(self, record):
+        if self._jsonl:
+            self._file.write(json.dumps(record) + "\n")
+        else:
+            # every line of the record is indented by one level inside the array
+            indented = json.dumps(record, indent=2).replace("\n", "\n  ")
+            self._file.write(("[\n  " if self._count == 0 else ",\n  ") + indented)
+        self._count += 1
+
+    def write_all(self, records: Iterable):
+        for record in records:
+            self.write(record)
+
+
+def write_json(content, path: str):
+    """Write a single JSON document (e.g. a trace) with indent=2, streamed to the
+    file instead of building the string first. Compressed when the path ends
+    with .gz.
+    """
+    with _open(path, "w") as f:
+        json.dump(content, f, indent=2)
+
+
+def iter_results(path: str) -> Iterator:
+    """Read back the records of a file written by ResultsWriter (or a plain JSON
+    list). JSONL files are read line by line.
+    """
+    with _open(path, "r") as f:
+        if _is_jsonl(path):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from json.load(f)
@@ -1,20 +1,29 @@
+import cProfile
+import hashlib
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import closing, nullcontext
 from itertools import permutations
-from math import factorial
-from typing import Tuple
+from time import perf_counter
+from typing import Iterator, List, Optional, Tuple
 
 from geniusweb.profile.utilityspace.LinearAdditiveUtilitySpace import \
     LinearAdditiveUtilitySpace
-from geniusweb.profileconnection.ProfileConnectionFactory import \
-    ProfileConnectionFactory
 from geniusweb.protocol.NegoSettings import NegoSettings
 from geniusweb.protocol.session.saop.SAOPState import SAOPState
 from geniusweb.simplerunner.ClassPathConnectionFactory import \
     ClassPathConnectionFactory
 from geniusweb.simplerunner.NegoRunner import NegoRunner
 from pyson.ObjectMapper import ObjectMapper
-from uri.uri import URI
 
+from agents.common.compiled_profile import compile_profile
+from agents.common.profile_cache import get_profile
 from utils.ask_proceed import ask_proceed
+from utils.journal import ResultsJournal, session_key
+from utils.pareto import get_specials
+from utils.planner import plan_sessions
+from utils.session_timer import SessionTimer
 from utils.std_out_reporter import StdOutReporter
 
 
@@ -22,11 +31,13 @@ def run_session(settings) -> Tuple[dict, dict]:
     agents = settings["agents"]
     profiles = settings["profiles"]
     rounds = settings["deadline_rounds"]
+    parameters = settings.get("parameters", [{}, {}])
 
     # quick and dirty checks
     assert isinstance(agents, list) and len(agents) == 2
     assert isinstance(profiles, list) and len(profiles) == 2
     assert isinstance(rounds, int) and rounds > 0
+    assert isinstance(parameters, list) and len(parameters) == 2
 
     # file path to uri
     profiles_uri = [f"file:{x}" for x in profiles]
@@ -41,7 +52,7 @@ def run_session(settings) -> Tuple[dict, dict]:
                             {
                                 "party": {
                                     "partyref": f"pythonpath:{agents[0]}",
-                                    "parameters": {},
+                                    "parameters": parameters[0],
                                 },
                                 "profile": profiles_uri[0],
                             }
@@ -54,7 +65,7 @@ def run_session(settings) -> Tuple[dict, dict]:
                             {
                                 "party": {
                                     "partyref": f"pythonpath:{agents[1]}",
-                                    "parameters": {},
+                                    "parameters": parameters[1],
                                 },
                                 "profile": profiles_uri[1],
                             }
@@ -66,40 +77,155 @@ def run_session(settings) -> Tuple[dict, dict]:
         }
     }
 
-    # parse settings dict to settings object
-    settings_obj = ObjectMapper().parse(settings_full, NegoSettings)
+    # optional instrumentation: a timing report in the summary and/or a cProfile dump
+    timer = SessionTimer(agents) if settings.get("timing", False) else None
+    profile_dir = settings.get("profile_dir")
+    profiler = cProfile.Profile() if profile_dir else None
+    start = perf_counter()
+
+    with timer or nullcontext(), profiler or nullcontext():
+        # parse settings dict to settings object
+        with _phase(timer, "parse_settings"):
+            settings_obj = ObjectMapper().parse(settings_full, NegoSettings)
+
+        # create the negotiation session runner object and run the negotiation session
+        with _phase(timer, "negotiation"):
+            runner = NegoRunner(
+                settings_obj, ClassPathConnectionFactory(), StdOutReporter(), 0
+            )
+            runner.run()
+
+        # get results from the session in class format and dict format
+        with _phase(timer, "serialize_state"):
+            results_class: SAOPState = runner.getProtocol().getState()
+            results_dict = ObjectMapper().toJson(results_class)
+
+        # add utilities to the results and create a summary
+        with _phase(timer, "process_results"):
+            results_trace, results_summary = process_results(
+                results_class, results_dict
+            )
+
+    if timer:
+        results_summary["timing"] = timer.summary()
+        results_summary["timing"]["total"] = perf_counter() - start
+    if profiler:
+        if not os.path.exists(profile_dir):
+            os.makedirs(profile_dir, exist_ok=True)
+        profiler.dump_stats(_profile_path(profile_dir, settings))
 
-    # create the negotiation session runner object
-    runner = NegoRunner(settings_obj, ClassPathConnectionFactory(), StdOutReporter(), 0)
+    return results_trace, results_summary
 
-    # run the negotiation session
-    runner.run()
 
-    # get results from the session in class format and dict format
-    results_class: SAOPState = runner.getProtocol().getState()
-    results_dict = ObjectMapper().toJson(results_class)
+def _phase(timer: Optional[SessionTimer], name: str):
+    return timer.phase(name) if timer else nullcontext()
 
-    # add utilities to the results and create a summary
-    results_trace, results_summary = process_results(results_class, results_dict)
 
-    return results_trace, results_summary
+def _profile_path(profile_dir: str, settings: dict) -> str:
+    # named after the agents, with a hash of the session to keep the names unique
+    names = "_".join(agent.split(".")[-1] for agent in settings["agents"])
+    digest = hashlib.sha1(session_key(settings).encode("utf-8")).hexdigest()[:10]
+    return os.path.join(profile_dir, f"{names}_{digest}.prof")
 
 
 def run_tournament(tournament_settings: dict) -> Tuple[list, list]:
-    # create agent permutations, ensures that every agent plays against every other agent on both sides of a profile set.
-    agents = tournament_settings["agents"]
-    profile_sets = tournament_settings["profile_sets"]
-    deadline_rounds = tournament_settings["deadline_rounds"]
+    tournament, results_summaries = [], []
+    for settings, _, results_summary in iter_tournament(tournament_settings):
+        tournament.append(settings)
+        results_summaries.append(results_summary)
 
-    num_sessions = (factorial(len(agents)) // factorial(len(agents) - 2)) * len(profile_sets)
-    if num_sessions > 100:
+    return tournament, results_summaries
+
+
+def iter_tournament(
+    tournament_settings: dict, traces: bool = False
+) -> Iterator[Tuple[dict, Optional[dict], dict]]:
+    """Run a tournament and yield (settings, results_trace, results_summary) of
+    every session in the order of the tournament, so the results can be written
+    away while the tournament runs. Only sessions that finish before an earlier
+    session are held back. The trace is None, unless traces is True (sessions
+    taken from the journal have no trace either).
+
+    Only the sessions that fit in the optional budget of the tournament settings
+    are run (see utils.planner.plan_sessions).
+    """
+    # create agent permutations, ensures that every agent plays against every other agent on both sides of a profile set.
+    tournament = tournament_sessions(tournament_settings)
+
+    # finished sessions are streamed to an optional journal, when resuming the sessions in it are skipped
+    journal_file = tournament_settings.get("journal")
+    resume = tournament_settings.get("resume", False)
+    journal = ResultsJournal(journal_file, resume) if journal_file else None
+    finished = journal.load() if journal else {}
+
+    # results that are ready but not yet yielded, by position in the tournament
+    ready = {}
+    for index, settings in enumerate(tournament):
+        if session_key(settings) in finished:
+            ready[index] = (None, finished[session_key(settings)])
+    pending = [i for i in range(len(tournament)) if i not in ready]
+
+    # plan the pending sessions within the budget, with an estimate of their wall time
+    plan = plan_sessions([tournament[i] for i in pending], tournament_settings)
+    print(plan.describe())
+    pending = [pending[i] for i in plan.selected]
+
+    # only ask for confirmation when someone can answer and there is no budget
+    num_sessions = len(pending)
+    if num_sessions > 100 and not plan.budget and sys.stdin.isatty():
         message = f"WARNING: this would run {num_sessions} negotiation sessions. Proceed?"
         if not ask_proceed(message):
             print("Exiting script")
             exit()
 
+    # the time budget is also enforced while running: no session is started after the
+    # deadline, the sessions that are running then still finish and are kept
+    max_minutes = plan.budget.get("max_minutes")
+    deadline = perf_counter() + max_minutes * 60 if max_minutes is not None else None
+
+    sessions = [tournament[i] for i in pending]
+    order = sorted(set(ready) | set(pending))
+    results = iter_sessions(sessions, plan.workers, traces, deadline)
+    position = 0
+    with journal or nullcontext(), closing(results):
+        while position < len(order):
+            if order[position] in ready:
+                yield (tournament[order[position]], *ready.pop(order[position]))
+                position += 1
+                continue
+
+            finished = next(results, None)
+            if finished is None:
+                print("Time budget used up, stopping the tournament")
+                break
+            session, results_trace, results_summary = finished
+            index = pending[session]
+            ready[index] = (results_trace, results_summary)
+            if journal:
+                journal.append(tournament[index], results_summary)
+
+    # after stopping early, the sessions that did finish are still yielded
+    for index in sorted(ready):
+        yield (tournament[index], *ready[index])
+
+
+def tournament_sessions(tournament_settings: dict) -> List[dict]:
+    """Expand the tournament settings into the settings of every session, in a
+    stable order: all agent permutations for the first profile set, then for
+    the second, etc.
+    """
+    agents = tournament_settings["agents"]
+    profile_sets = tournament_settings["profile_sets"]
+    deadline_rounds = tournament_settings["deadline_rounds"]
+    # optional parameters per agent classpath, passed to the agent in every session
+    parameters = tournament_settings.get("parameters")
+    # optional instrumentation, passed to every session
+    instrumentation = {
+        k: tournament_settings[k]
+        for k in ("timing", "profile_dir")
+        if tournament_settings.get(k)
+    }
 
-    results_summaries = []
     tournament = []
     for profiles in profile_sets:
         # quick an dirty check
@@ -111,15 +237,66 @@ def run_tournament(tournament_settings: dict) -> Tuple[list, list]:
                 "profiles": profiles,
                 "deadline_rounds": deadline_rounds,
             }
-
-            # run a single negotiation session
-            _, results_summary = run_session(settings)
-
-            # assemble results
+            if parameters:
+                settings["parameters"] = [parameters.get(a, {}) for a in agent_duo]
+            settings.update(instrumentation)
             tournament.append(settings)
-            results_summaries.append(results_summary)
 
-    return tournament, results_summaries
+    return tournament
+
+
+def iter_sessions(
+    sessions: List[dict],
+    workers: Optional[int] = 1,
+    traces: bool = False,
+    deadline: Optional[float] = None,
+) -> Iterator[Tuple[int, Optional[dict], dict]]:
+    """Run a list of sessions and yield (index, results_trace, results_summary) as
+    soon as a session finishes. With workers > 1 (or None for one worker per CPU
+    core) the sessions run in a pool of worker processes, one session per task,
+    so results can arrive out of order. The index refers to the position in
+    sessions. The trace is None, unless traces is True.
+
+    With a deadline (a perf_counter time) no session is started after it. The
+    sessions that are running at the deadline still finish and are yielded, the
+    others are not run.
+    """
+    if workers is not None and workers <= 1:
+        for index, settings in enumerate(sessions):
+            if deadline is not None and perf_counter() > deadline:
+                return
+            yield (index, *_run_session_results(settings, traces))
+        return
+
+    workers = workers or os.cpu_count() or 1
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        # a session is only submitted when a worker is free, so none is waiting in the
+        # queue of the pool when the deadline passes
+        queued = iter(enumerate(sessions))
+        running = {}
+        while True:
+            while len(running) < workers and (deadline is None or perf_counter() <= deadline):
+                index, settings = next(queued, (None, None))
+                if settings is None:
+                    break
+                running[executor.submit(_run_session_results, settings, traces)] = index
+            if not running:
+                return
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                # drop the future, so its results can be freed once they are written
+                yield (running.pop(future), *future.result())
+    finally:
+        # do not start the queued sessions when we stop early (crash or Ctrl-C)
+        executor.shutdown(cancel_futures=True)
+
+
+def _run_session_results(settings: dict, traces: bool) -> Tuple[Optional[dict], dict]:
+    # the trace can be large, it is only send back to the main process when asked for
+    results_trace, results_summary = run_session(settings)
+    return (results_trace if traces else None), results_summary
 
 
 def process_results(results_class, results_dict):
@@ -141,24 +318,29 @@ def process_results(results_class, results_dict):
             for k, v in results_dict["partyprofiles"].items()
         }
 
-        # iterate both action classes and dict entries
-        actions_iter = zip(results_class.getActions(), results_dict["actions"])
-
-        for num_offer, (action_class, action_dict) in enumerate(actions_iter):
+        # collect the offers and accepts together with their bids
+        offers, bids = [], []
+        for action_class, action_dict in zip(
+            results_class.getActions(), results_dict["actions"]
+        ):
             if "Offer" in action_dict:
-                offer = action_dict["Offer"]
+                offers.append(action_dict["Offer"])
             elif "Accept" in action_dict:
-                offer = action_dict["Accept"]
+                offers.append(action_dict["Accept"])
             else:
                 continue
+            bids.append(action_class.getBid())
 
-            # add utility of both agents
-            bid = action_class.getBid()
-            offer["utilities"] = {
-                k: float(v.getUtility(bid)) for k, v in utility_funcs.items()
-            }
+        # add utility of both agents, computed for the whole trace at once. The bids are encoded
+        # per profile, as the profiles may order the values of their domain differently
+        compiled = {k: compile_profile(v) for k, v in utility_funcs.items()}
+        utilities = {
+            k: v.utilities(v.encode_bids(bids)).tolist() for k, v in compiled.items()
+        }
+        for num, offer in enumerate(offers):
+            offer["utilities"] = {k: v[num] for k, v in utilities.items()}
 
-        results_summary["num_offers"] = num_offer + 1
+        results_summary["num_offers"] = len(results_dict["actions"])
 
         # gather a summary of results
         if "Accept" in action_dict:
@@ -188,14 +370,21 @@ def process_results(results_class, results_dict):
         results_summary["social_welfare"] = 0
         results_summary["result"] = "ERROR"
 
+    # distance of the outcome to the Pareto front, Nash and Kalai point of the domain
+    parties = list(results_dict["partyprofiles"])
+    specials = get_specials(
+        [results_dict["partyprofiles"][party]["profile"] for party in parties]
+    )
+    if specials:
+        utilities = [results_summary[f"utility_{p.split('_')[-1]}"] for p in parties]
+        results_summary.update(specials.distances(*utilities))
+
     return results_dict, results_summary
 
 
 def get_utility_function(profile_uri) -> LinearAdditiveUtilitySpace:
-    profile_connection = ProfileConnectionFactory.create(
-        URI(profile_uri), StdOutReporter()
-    )
-    profile = profile_connection.getProfile()
+    # profiles are parsed once per process and then taken from the profile cache
+    profile = get_profile(profile_uri)
     assert isinstance(profile, LinearAdditiveUtilitySpace)
 
     return profile
@@ -0,0 +1,137 @@
+import importlib
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import wraps
+from statistics import mean
+from time import perf_counter
+from typing import Dict, List
+
+from geniusweb.inform.ActionDone import ActionDone
+from geniusweb.inform.Settings import Settings
+from geniusweb.inform.YourTurn import YourTurn
+
+
+class SessionTimer:
+    """
+    Records where the wall time of a negotiation session goes.
+
+    Phases of run_session (parsing the settings, running the session,
+    serializing the state, processing the results) are timed with phase(). While
+    the timer is active, notifyChange of the agent classes is wrapped to time
+    every message per agent: the Settings message (profile loading), every
+    YourTurn (the first one separately, as most agents build their bid tables
+    lazily on their first turn) and the ActionDone messages. Agent times are
+    exclusive: when an agent call runs inside another agent call (e.g. when the
+    protocol notifies the opponent synchronously) the time of the inner call is
+    not counted for the outer agent.
+    """
+
+    def __init__(self, agents: List[str]):
+        """
+        Args:
+            agents (List[str]): classpaths of the agents in the session.
+        """
+        self._classes = []
+        for classpath in agents:
+            module, name = classpath.rsplit(".", 1)
+            cls = getattr(importlib.import_module(module), name)
+            if cls not in self._classes:
+                self._classes.append(cls)
+        self._originals = {}
+
+        self._phases: Dict[str, float] = {}
+        # party name of every agent instance, taken from its Settings message
+        self._parties: Dict[int, str] = {}
+        self._agent_names: Dict[str, str] = {}
+        self._settings: Dict[str, float] = defaultdict(float)
+        self._turns: Dict[str, List[float]] = defaultdict(list)
+        self._actions_done: Dict[str, float] = defaultdict(float)
+        # stack of [agent id, child time] per thread, for exclusive times
+        self._local = threading.local()
+
+    def __enter__(self) -> "SessionTimer":
+        for cls in self._classes:
+            self._originals[cls] = cls.__dict__.get("notifyChange")
+            cls.notifyChange = self._wrap(cls.notifyChange)
+        return self
+
+    def __exit__(self, *exc):
+        for cls, original in self._originals.items():
+            if original is None:
+                del cls.notifyChange
+            else:
+                cls.notifyChange = original
+        self._originals = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self._phases[name] = self._phases.get(name, 0.0) + perf_counter() - start
+
+    def _wrap(self, notify_change):
+        timer = self
+
+        @wraps(notify_change)
+        def timed_notify_change(agent, info):
+            stack = timer._stack()
+            # a super() call of an agent that is timed already
+            if stack and stack[-1][0] == id(agent):
+                return notify_change(agent, info)
+
+            if isinstance(info, Settings):
+                timer._parties[id(agent)] = info.getID().getName()
+
+            frame = [id(agent), 0.0]
+            stack.append(frame)
+            start = perf_counter()
+            try:
+                return notify_change(agent, info)
+            finally:
+                elapsed = perf_counter() - start
+                stack.pop()
+                if stack:
+                    stack[-1][1] += elapsed
+                timer._record(agent, info, elapsed - frame[1])
+
+        return timed_notify_change
+
+    def _stack(self) -> list:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def _record(self, agent, info, elapsed: float):
+        party = self._parties.get(id(agent))
+        if party is None:
+            return
+        self._agent_names[party] = type(agent).__name__
+        if isinstance(info, Settings):
+            self._settings[party] += elapsed
+        elif isinstance(info, YourTurn):
+            self._turns[party].append(elapsed)
+        elif isinstance(info, ActionDone):
+            self._actions_done[party] += elapsed
+
+    def summary(self) -> dict:
+        """Returns the timing report (in seconds) that is added to the results
+        summary. Agents are reported under agent_<position>, like the agent names
+        and utilities in the results summary.
+        """
+        timing = dict(self._phases)
+        for party, name in self._agent_names.items():
+            turns = self._turns[party]
+            timing[f"agent_{party.split('_')[-1]}"] = {
+                "agent": name,
+                "settings": self._settings[party],
+                "first_turn": turns[0] if turns else 0,
+                "turn_mean": mean(turns[1:]) if len(turns) > 1 else 0,
+                "turn_max": max(turns[1:]) if len(turns) > 1 else 0,
+                "turn_total": sum(turns),
+                "action_done_total": self._actions_done[party],
+                "turns": turns,
+            }
+        return timing